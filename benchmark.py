@@ -0,0 +1,171 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.log import logger
+from core.profiling import profiler
+from core.replay import ReplayDevice
+from core.screen import Screen
+from core.screenshot_processor import ScreenshotProcessor
+from core.templates import TemplateRegistry
+from db.init import seed_cultivation_levels, seed_rarities, seed_abilities, seed_pet, seed_relics, seed_curios
+from db.models.base import Base
+from db.service.char_scraper_service import CharacterScraperService
+from scrapers.character_scraper import CharacterScraper
+
+"""
+Full taoist scrape benchmark on a recorded session, so results are repeatable without an emulator.
+
+Record a session live, starting from another taoist's character screen:
+    python benchmark.py record recordings/taoist
+Then replay it and write per-phase timings as JSON, optionally checking against an earlier result:
+    python benchmark.py run recordings/taoist --output bench.json --compare baseline.json
+"""
+
+PHASES = ["scrape_name", "scrape_relics", "scrape_pets", "scrape_total_br", "scrape_cultivation", "scrape_abilities",
+          "scrape_br_stats", "scrape_stat_stats"]
+# Phases timed inside scrape() rather than wrapped here, collecting the deferred OCR results is one
+INNER_PHASES = ["ocr_results"]
+CATEGORIES = ["capture", "matching", "ocr", "input", "sleep", "other"]
+
+
+def memory_session():
+    """ Returns a seeded in-memory database session, so benchmarks never touch the real data. """
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    for seed in (seed_cultivation_levels, seed_rarities, seed_abilities, seed_pet, seed_relics, seed_curios):
+        seed(session)
+    return session
+
+
+def make_scraper(screen: Screen, processor: ScreenshotProcessor, session) -> CharacterScraper:
+    """ Returns a character scraper with each phase method timed as a profiler phase. """
+    scraper = CharacterScraper(screen=screen, service=CharacterScraperService(db=session), processor=processor,
+                               logger=logger)
+    for name in PHASES:
+        def phased(*args, method=getattr(scraper, name), name=name, **kwargs):
+            with profiler.phase(name):
+                return method(*args, **kwargs)
+        setattr(scraper, name, phased)
+    return scraper
+
+
+def record(folder: str, serial: str):
+    """ Runs one live scrape, recording every frame and input to the folder. """
+    screen = Screen(logger, serial, record_to=folder)
+    session = memory_session()
+    try:
+        CharacterScraper(screen=screen, service=CharacterScraperService(db=session), processor=ScreenshotProcessor(),
+                         logger=logger).scrape()
+    finally:
+        screen.close()
+        session.close()
+
+
+def run(folder: str, repeats: int, ocr_cache: bool = False) -> dict:
+    """ Replays the recording repeats times and returns the timings averaged per taoist.
+    Every repeat reads the same frames, so the OCR cache is off unless ocr_cache is set, otherwise every repeat after
+    the first would be all cache hits.
+    """
+    templates = TemplateRegistry.load()
+    processor = ScreenshotProcessor(cache_size=4096 if ocr_cache else 0)
+    session = memory_session()
+    totals = []
+    profiler.reset()
+    profiler.enabled = True
+    try:
+        for _ in range(repeats):
+            device = ReplayDevice(folder)
+            screen = Screen(logger, source=device, input_backend=device, templates=templates)
+            scraper = make_scraper(screen, processor, session)
+            start = time.perf_counter()
+            with profiler.phase("scrape"):
+                scraper.scrape()
+            totals.append(time.perf_counter() - start)
+            screen.close()
+    finally:
+        profiler.enabled = False
+        session.close()
+
+    report = profiler.report()
+    phases = {}
+    for name in PHASES + INNER_PHASES:
+        if name not in report:
+            continue
+        result = report[name]
+        phases[name] = {"seconds": result["total"] / repeats,
+                        **{c: result["categories"].get(c, 0.) / repeats for c in CATEGORIES},
+                        "counts": {c: n / repeats for c, n in result["counts"].items()}}
+    commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    return {
+        "commit": commit,
+        "recording": folder,
+        "repeats": repeats,
+        "ocr_cache": ocr_cache,
+        "seconds_per_taoist": statistics.mean(totals),
+        "seconds_per_taoist_min": min(totals),
+        "taoists_per_hour": 3600 / statistics.mean(totals),
+        "phases": phases,
+    }
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list:
+    """ Returns descriptions of the phases, and the overall time, that got slower than the baseline by more than
+    the tolerance fraction.
+    """
+    regressions = []
+    pairs = [("seconds_per_taoist", result["seconds_per_taoist"], baseline["seconds_per_taoist"])]
+    pairs += [(name, phase["seconds"], baseline["phases"][name]["seconds"])
+              for name, phase in result["phases"].items() if name in baseline["phases"]]
+    for name, new, old in pairs:
+        if old > 0 and new > old * (1 + tolerance):
+            regressions.append(f"{name}: {old:.3f}s -> {new:.3f}s ({new / old - 1:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Taoist scrape benchmark")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_parser = commands.add_parser("record", help="Record a live scrape")
+    record_parser.add_argument("folder")
+    record_parser.add_argument("--device", default="emulator-5554", help="adb serial to record from")
+    run_parser = commands.add_parser("run", help="Benchmark a recorded scrape")
+    run_parser.add_argument("folder")
+    run_parser.add_argument("--repeats", type=int, default=3)
+    run_parser.add_argument("--output", help="JSON file to write results to, printed if not given")
+    run_parser.add_argument("--compare", help="Earlier results JSON to check for regressions against")
+    run_parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed slowdown before failing")
+    run_parser.add_argument("--ocr-cache", action="store_true",
+                            help="Keep the OCR cache across repeats, measures a warm cache rather than a new taoist")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.folder, args.device)
+        return
+
+    result = run(args.folder, args.repeats, args.ocr_cache)
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(result, json.load(file), args.tolerance)
+        for regression in regressions:
+            logger.warning(f"Regression in {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+import subprocess
+from typing import List
+
+
+def adb_command(serial: str = None, *args) -> List[str]:
+    """ Returns an adb command line, targeted at the given device serial if there is one. """
+    return ["adb", *(["-s", serial] if serial else []), *args]
+
+
+def connected_devices() -> List[str]:
+    """ Returns the serials of all devices adb reports as ready. """
+    result = subprocess.run(["adb", "devices"], capture_output=True, text=True)
+    devices = []
+    for line in result.stdout.splitlines()[1:]:
+        parts = line.split()
+        if len(parts) == 2 and parts[1] == "device":
+            devices.append(parts[0])
+    return devices
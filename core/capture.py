@@ -0,0 +1,223 @@
+import struct
+import subprocess
+import threading
+import time
+
+import av
+import cv2
+import numpy as np
+
+from .adb import adb_command
+
+
+class CaptureFailed(Exception):
+    pass
+
+
+class PullCapture:
+    """ Original capture path, writes a PNG on the device, pulls it to disk and decodes it.
+
+    Parameters
+    ----------
+    serial : str, optional
+        adb serial of the device to capture, uses the only connected device if not given.
+    path : str, optional
+        Local file to pull the screenshot to, defaults to one per device.
+    """
+
+    def __init__(self, serial: str = None, path: str = None):
+        self.serial = serial
+        self.path = path if path is not None else f"./tmp/screen{'_' + serial.replace(':', '_') if serial else ''}.png"
+
+    def grab(self) -> np.ndarray:
+        """ Returns the current screen as a BGR image. """
+        subprocess.run(adb_command(self.serial, "shell", "screencap", "-p", "/sdcard/screen.png"),
+                       stdout=subprocess.DEVNULL)
+        subprocess.run(adb_command(self.serial, "pull", "/sdcard/screen.png", self.path),
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        img = cv2.imread(self.path)
+        if img is None:
+            raise CaptureFailed(f"Failed to read pulled screenshot {self.path}")
+        return img
+
+    def close(self):
+        pass
+
+
+class RawCapture:
+    """ Captures raw RGBA frames with ``screencap`` over a persistent ``adb shell -T sh`` channel.
+    Frames go straight from the pipe into a numpy array, so nothing touches disk and no PNG is encoded or decoded.
+
+    The channel uses adb's shell protocol without a pty, which forwards stdin and passes binary output through
+    untouched (``exec-out`` never forwards stdin). The raw header is (width, height, format) as little-endian uint32,
+    with an extra colour space field on newer Android versions. The header size is worked out once from a one-shot
+    capture and reused for the channel. A channel frame that doesn't arrive within READ_TIMEOUT seconds kills the
+    channel and falls back to a one-shot capture.
+
+    Parameters
+    ----------
+    serial : str, optional
+        adb serial of the device to capture, uses the only connected device if not given.
+    """
+    # Android PixelFormat values with 4 bytes per pixel
+    FORMATS = {1: cv2.COLOR_RGBA2BGR, 2: cv2.COLOR_RGBA2BGR, 5: cv2.COLOR_BGRA2BGR}
+    BYTES_PER_PIXEL = 4
+    # Seconds a channel frame may take before the channel is given up on
+    READ_TIMEOUT = 2.0
+
+    def __init__(self, serial: str = None):
+        self.serial = serial
+        self.header_size = None
+        self.channel = None
+
+    def _parse(self, header, pixels, offset: int = 0) -> np.ndarray:
+        """ Converts a raw screencap header and pixel buffer to a BGR image. """
+        width, height, fmt = struct.unpack_from("<III", header)
+        if fmt not in self.FORMATS:
+            raise CaptureFailed(f"Unsupported screencap pixel format {fmt}")
+        img = np.frombuffer(pixels, dtype=np.uint8, count=width * height * self.BYTES_PER_PIXEL, offset=offset)
+        return cv2.cvtColor(img.reshape((height, width, self.BYTES_PER_PIXEL)), self.FORMATS[fmt])
+
+    def _grab_once(self) -> np.ndarray:
+        """ Runs a single ``exec-out screencap`` and sets the header size from the output length. """
+        data = subprocess.run(adb_command(self.serial, "exec-out", "screencap"), capture_output=True).stdout
+        if len(data) < 12:
+            raise CaptureFailed("No data returned from screencap")
+        width, height, _ = struct.unpack_from("<III", data)
+        self.header_size = len(data) - width * height * self.BYTES_PER_PIXEL
+        if self.header_size not in (12, 16):
+            raise CaptureFailed(f"Unexpected screencap size {len(data)} for {width}x{height}")
+        return self._parse(data, data, self.header_size)
+
+    def _open(self):
+        self.channel = subprocess.Popen(adb_command(self.serial, "shell", "-T", "sh"), stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=0)
+
+    def _read(self, size: int) -> bytes:
+        """ Reads exactly size bytes from the channel. """
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        read = 0
+        while read < size:
+            n = self.channel.stdout.readinto(view[read:])
+            if not n:
+                raise CaptureFailed("Capture channel closed")
+            read += n
+        return buffer
+
+    def _grab_channel(self) -> np.ndarray:
+        if self.channel is None or self.channel.poll() is not None:
+            self._open()
+        self.channel.stdin.write(b"screencap\n")
+        self.channel.stdin.flush()
+        # Pipe reads can't time out on every platform, so kill the channel instead, which ends the read
+        channel = self.channel
+        watchdog = threading.Timer(self.READ_TIMEOUT, channel.kill)
+        watchdog.start()
+        try:
+            header = self._read(self.header_size)
+            width, height, _ = struct.unpack_from("<III", header)
+            pixels = self._read(width * height * self.BYTES_PER_PIXEL)
+        finally:
+            watchdog.cancel()
+        return self._parse(header, pixels)
+
+    def grab(self) -> np.ndarray:
+        """ Returns the current screen as a BGR image. """
+        if self.header_size is None:
+            return self._grab_once()
+        try:
+            return self._grab_channel()
+        except (CaptureFailed, OSError):
+            # Channel died mid-frame, drop it and fall back to a one-shot capture
+            self.close()
+            return self._grab_once()
+
+    def close(self):
+        if self.channel is not None:
+            self.channel.kill()
+            self.channel.wait()
+            self.channel = None
+
+
+class StreamCapture:
+    """ Keeps ``screenrecord`` streaming h264 and decodes it in a background thread, holding the latest frame in memory.
+    Frames are then available at video rate without a capture round trip.
+
+    screenrecord only sends frames when the screen changes and stops itself after its time limit, so the stream is
+    restarted whenever it ends. If no frame has been decoded for stale_after seconds the fallback source is used
+    instead, which covers both a stalled stream and a static screen.
+
+    Parameters
+    ----------
+    serial : str, optional
+        adb serial of the device to capture, uses the only connected device if not given.
+    fallback : optional
+        Frame source to use while the stream is stale. Defaults to RawCapture.
+    stale_after : float, optional
+        Seconds without a new decoded frame before falling back.
+    bit_rate : str, optional
+        Encoder bit rate passed to screenrecord.
+    """
+    frame_interval = 1 / 30
+
+    def __init__(self, serial: str = None, fallback=None, stale_after: float = 1.0, bit_rate: str = "8M"):
+        self.serial = serial
+        self.fallback = RawCapture(serial) if fallback is None else fallback
+        self.stale_after = stale_after
+        self.bit_rate = bit_rate
+        self.process = None
+        self.thread = None
+        self.running = False
+        self.lock = threading.Lock()
+        self.latest = None
+        self.latest_time = 0.
+
+    def start(self):
+        """ Starts the background decode thread if it isn't running. """
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="StreamCapture", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while self.running:
+            self.process = subprocess.Popen(
+                adb_command(self.serial, "exec-out", "screenrecord", "--output-format=h264",
+                            f"--bit-rate={self.bit_rate}", "-"),
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            try:
+                with av.open(self.process.stdout, format="h264") as container:
+                    for frame in container.decode(video=0):
+                        img = frame.to_ndarray(format="bgr24")
+                        with self.lock:
+                            self.latest = img
+                            self.latest_time = time.monotonic()
+                        if not self.running:
+                            break
+            except av.error.FFmpegError:
+                # Stream was cut off, restart it below
+                pass
+            finally:
+                self.process.kill()
+                self.process.wait()
+            time.sleep(0.1)
+
+    def grab(self) -> np.ndarray:
+        """ Returns the latest decoded frame, or a fallback capture if the stream is stale. """
+        self.start()
+        with self.lock:
+            img, frame_time = self.latest, self.latest_time
+        if img is None or time.monotonic() - frame_time > self.stale_after:
+            return self.fallback.grab()
+        return img
+
+    def close(self):
+        self.running = False
+        if self.process is not None:
+            self.process.kill()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+            self.thread = None
+        self.fallback.close()
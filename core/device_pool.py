@@ -0,0 +1,41 @@
+from typing import List, Tuple
+
+from .adb import connected_devices
+
+
+class DevicePool:
+    """ A set of emulator serials to spread work across, one Screen per device.
+
+    Parameters
+    ----------
+    serials : list of str, optional
+        adb serials to use, defaults to every connected device.
+    """
+
+    def __init__(self, serials: List[str] = None):
+        self.serials = list(serials) if serials else connected_devices()
+        if not self.serials:
+            raise RuntimeError("No adb devices available for the pool")
+
+    def __len__(self):
+        return len(self.serials)
+
+    def shards(self, start: int, end: int) -> List[Tuple[str, int, int]]:
+        """ Splits the inclusive range start..end into contiguous blocks, one per device.
+
+        Returns
+        -------
+        list of (str, int, int)
+            (serial, first, last) for each device that has work, earlier devices take any remainder.
+        """
+        total = end - start + 1
+        size, remainder = divmod(total, len(self.serials))
+        shards = []
+        first = start
+        for i, serial in enumerate(self.serials):
+            count = size + (1 if i < remainder else 0)
+            if count == 0:
+                break
+            shards.append((serial, first, first + count - 1))
+            first += count
+        return shards
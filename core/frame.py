@@ -0,0 +1,87 @@
+from functools import cached_property
+
+import cv2
+import numpy as np
+
+
+def thumbnail(img: np.ndarray, scale: float) -> np.ndarray:
+    """ Returns a small grayscale copy of a BGR or grayscale image. """
+    small = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+
+
+class Frame:
+    """ A single captured screen with lazily computed and cached views.
+    The pixels are read only so views can be shared between callers without copying.
+
+    Parameters
+    ----------
+    pixels : array
+        The BGR screen image.
+
+    Attributes
+    ----------
+    colour : array
+        The BGR screen image.
+    """
+    VIEWS = {"gray": cv2.COLOR_BGR2GRAY, "hsv": cv2.COLOR_BGR2HSV}
+    THUMBNAIL_SCALE = 1 / 8
+
+    def __init__(self, pixels: np.ndarray):
+        pixels.flags.writeable = False
+        self.colour = pixels
+        self._crops = {}
+
+    @property
+    def shape(self):
+        return self.colour.shape
+
+    def _convert(self, img: np.ndarray, view: str) -> np.ndarray:
+        converted = cv2.cvtColor(img, self.VIEWS[view])
+        converted.flags.writeable = False
+        return converted
+
+    @cached_property
+    def gray(self) -> np.ndarray:
+        """ Grayscale view of the full frame. """
+        return self._convert(self.colour, "gray")
+
+    @cached_property
+    def hsv(self) -> np.ndarray:
+        """ HSV view of the full frame. """
+        return self._convert(self.colour, "hsv")
+
+    @cached_property
+    def thumbnail(self) -> np.ndarray:
+        """ Downscaled grayscale view, used for cheap change detection. """
+        small = thumbnail(self.colour, self.THUMBNAIL_SCALE)
+        small.flags.writeable = False
+        return small
+
+    def crop(self, area: tuple, view: str = "colour") -> np.ndarray:
+        """ Returns a cached crop of the frame.
+        Slices the full view if it has been computed already, otherwise only converts the cropped region.
+
+        Parameters
+        ----------
+        area : tuple
+            (x1, x2, y1, y2) specifying the crop rectangle.
+        view : str, optional
+            One of 'colour', 'gray' or 'hsv'.
+
+        Returns
+        -------
+        array
+            The read only cropped image.
+        """
+        key = (tuple(area), view)
+        if key not in self._crops:
+            x1, x2, y1, y2 = area
+            if view == "colour":
+                crop = self.colour[y1:y2, x1:x2]
+            elif view in self.__dict__:
+                crop = self.__dict__[view][y1:y2, x1:x2]
+            else:
+                crop = self._convert(self.colour[y1:y2, x1:x2], view)
+            self._crops[key] = crop
+        return self._crops[key]
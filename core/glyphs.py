@@ -0,0 +1,206 @@
+import json
+import os
+import sys
+
+import cv2
+import numpy as np
+
+from .parsing import parse_text_number
+
+# (width, height) every glyph is resized to before comparing
+GLYPH_SIZE = (12, 16)
+# Smallest component in pixels that isn't treated as noise
+MIN_AREA = 3
+# Fraction of the narrower of two components' widths they have to overlap in x by to be one glyph
+MERGE_OVERLAP = 0.25
+
+
+def segment(img: np.ndarray):
+    """ Splits a grayscale line of text into glyphs by connected components.
+
+    The crop is binarised with Otsu's threshold, taking the minority side as the text. Components overlapping in x
+    by more than MERGE_OVERLAP of the narrower one are merged, so glyphs made of several parts like the game's '%',
+    two rings either side of a slash, stay together.
+
+    Returns
+    -------
+    list of (array, float)
+        Each glyph as a GLYPH_SIZE float image in [0, 1] and its height relative to the tallest glyph, left to right.
+    """
+    _, binary = cv2.threshold(img, 0, 1, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    if binary.mean() > 0.5:
+        binary = 1 - binary
+    _, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    boxes = []
+    # Label 0 is the background
+    for x, y, w, h, area in sorted(stats[1:].tolist()):
+        if area < MIN_AREA:
+            continue
+        if boxes:
+            bx1, by1, bx2, by2 = boxes[-1]
+            overlap = min(bx2, x + w) - max(bx1, x)
+            if overlap > MERGE_OVERLAP * min(bx2 - bx1, w):
+                boxes[-1] = [min(bx1, x), min(by1, y), max(bx2, x + w), max(by2, y + h)]
+                continue
+        boxes.append([x, y, x + w, y + h])
+    if not boxes:
+        return []
+
+    line_height = max(y2 - y1 for _, y1, _, y2 in boxes)
+    glyphs = []
+    for x1, y1, x2, y2 in boxes:
+        glyph = cv2.resize(binary[y1:y2, x1:x2].astype(np.float32), GLYPH_SIZE, interpolation=cv2.INTER_AREA)
+        glyphs.append((glyph, (y2 - y1) / line_height))
+    return glyphs
+
+
+class GlyphLibrary:
+    """ Labelled glyph samples of the game's numeric font.
+
+    Attributes
+    ----------
+    chars : array
+        Character of each sample.
+    glyphs : array
+        (n, height, width) normalised sample images.
+    heights : array
+        Height of each sample relative to the tallest glyph of its line, this separates '.' from the digits.
+
+    The shipped library at PATH is built from the crops labelled in screencaps/glyph_labels.json with
+    ``python -m core.glyphs screencaps/glyph_labels.json``, delete it first to rebuild it from scratch. No screencap
+    shows a 'T' suffix, so its samples are capital T's from panel text in the same font.
+    """
+    PATH = "resources/glyphs.npz"
+    # Most samples kept per character
+    MAX_SAMPLES = 20
+    # Samples closer than this to an existing one add nothing
+    DUPLICATE_SCORE = 0.98
+
+    def __init__(self):
+        self.chars = np.array([], dtype="<U1")
+        self.glyphs = np.zeros((0, GLYPH_SIZE[1], GLYPH_SIZE[0]), dtype=np.float32)
+        self.heights = np.zeros(0, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.chars)
+
+    def add(self, char: str, glyph: np.ndarray, height: float):
+        """ Adds a sample unless the character is full or an equivalent sample exists. """
+        same = self.chars == char
+        if same.sum() >= self.MAX_SAMPLES:
+            return
+        if same.any() and (1 - np.abs(self.glyphs[same] - glyph).mean(axis=(1, 2))).max() > self.DUPLICATE_SCORE:
+            return
+        self.chars = np.append(self.chars, char)
+        self.glyphs = np.concatenate([self.glyphs, glyph[None]])
+        self.heights = np.append(self.heights, np.float32(height))
+
+    def learn(self, img: np.ndarray, text: str) -> bool:
+        """ Adds the glyphs of a grayscale line crop with known text.
+
+        Returns
+        -------
+        bool
+            Whether the crop split into exactly one glyph per character, nothing is learnt otherwise.
+        """
+        chars = text.replace(" ", "")
+        glyphs = segment(img)
+        if not chars or len(glyphs) != len(chars):
+            return False
+        for char, (glyph, height) in zip(chars, glyphs):
+            self.add(char, glyph, height)
+        return True
+
+    def save(self, path: str = PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(path, chars=self.chars, glyphs=self.glyphs, heights=self.heights)
+
+    @classmethod
+    def load(cls, path: str = PATH):
+        """ Loads a saved library, or returns an empty one if there isn't one yet. """
+        library = cls()
+        if os.path.exists(path):
+            with np.load(path) as data:
+                library.chars, library.glyphs, library.heights = data["chars"], data["glyphs"], data["heights"]
+        return library
+
+
+class GlyphReader:
+    """ Reads numbers in the game's fixed font by matching segmented glyphs against a GlyphLibrary.
+    Needs no OCR model, so a read takes well under a millisecond.
+
+    Parameters
+    ----------
+    library : GlyphLibrary
+        Samples to classify glyphs against.
+    """
+    # Lowest per glyph match score for a read to count as confident
+    MIN_CONFIDENCE = 0.85
+    # Smallest lead a glyph's best match needs over the best sample of any other character
+    MIN_MARGIN = 0.05
+    # Largest difference in relative height between a glyph and a sample it can match
+    HEIGHT_TOLERANCE = 0.2
+
+    def __init__(self, library: GlyphLibrary):
+        self.library = library
+
+    def read(self, img: np.ndarray) -> (str, float):
+        """ Returns the text of a grayscale line crop and the score of its worst matching glyph.
+        The score is 0 if any glyph matches another character nearly as well, less than MIN_MARGIN behind.
+        """
+        glyphs = segment(img)
+        if not glyphs or not len(self.library):
+            return "", 0.
+        images = np.stack([glyph for glyph, _ in glyphs])
+        heights = np.array([height for _, height in glyphs], dtype=np.float32)
+        # (glyphs, samples) scores, ruling out samples of the wrong height
+        scores = 1 - np.abs(images[:, None] - self.library.glyphs[None]).mean(axis=(2, 3))
+        scores[np.abs(heights[:, None] - self.library.heights[None]) > self.HEIGHT_TOLERANCE] = 0
+        best = scores.argmax(axis=1)
+        chars = self.library.chars[best]
+        best_scores = scores[np.arange(len(best)), best]
+        # Best score of each glyph among samples of other characters
+        others = np.where(chars[:, None] == self.library.chars[None], 0, scores).max(axis=1)
+        if (best_scores - others < self.MIN_MARGIN).any():
+            return "".join(chars), 0.
+        return "".join(chars), float(best_scores.min())
+
+    def read_number(self, img: np.ndarray):
+        """ Returns the number in a grayscale line crop, or None if the read isn't confident or doesn't parse. """
+        text, confidence = self.read(img)
+        if confidence < self.MIN_CONFIDENCE:
+            return None
+        try:
+            return parse_text_number(text)
+        except ValueError:
+            return None
+
+
+def build_library(labels_path: str, path: str = GlyphLibrary.PATH) -> GlyphLibrary:
+    """ Builds a glyph library from labelled screenshots and saves it.
+
+    Parameters
+    ----------
+    labels_path : str
+        JSON list of {"file": screenshot path, "area": [x1, x2, y1, y2], "text": text in the area}.
+    path : str
+        File to save the library to, any existing samples are kept.
+
+    The shipped library is built with ``python -m core.glyphs screencaps/glyph_labels.json``, crops that don't split
+    into one glyph per character are reported and skipped.
+    """
+    library = GlyphLibrary.load(path)
+    with open(labels_path) as file:
+        labels = json.load(file)
+    for label in labels:
+        img = cv2.imread(label["file"], cv2.IMREAD_GRAYSCALE)
+        x1, x2, y1, y2 = label["area"]
+        if img is None or not library.learn(img[y1:y2, x1:x2], label["text"]):
+            print(f"Skipped {label['file']} {label['area']}, couldn't split into '{label['text']}'")
+    library.save(path)
+    return library
+
+
+if __name__ == "__main__":
+    # python -m core.glyphs screencaps/glyph_labels.json
+    build_library(*sys.argv[1:])
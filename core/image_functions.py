@@ -1,41 +1,263 @@
 import cv2
 import numpy as np
 
-from skimage.metrics import structural_similarity as ssim
+from .frame import Frame, thumbnail
 
 
-def locate_image(img1, img2, threshold: float):
+def search_window(img, template, region: tuple = None):
+    """ Returns the part of a preprocessed image (or grayscale Frame) to search and the (x, y) offset of it.
+    The region (x1, x2, y1, y2) is clipped to the image, and ignored if the template wouldn't fit inside it.
+    """
+    height, width = img.shape[:2]
+    if region is not None:
+        x1, x2, y1, y2 = region
+        x1, x2, y1, y2 = max(x1, 0), min(x2, width), max(y1, 0), min(y2, height)
+        if x2 - x1 >= template.shape[1] and y2 - y1 >= template.shape[0]:
+            crop = img.crop((x1, x2, y1, y2), "gray") if isinstance(img, Frame) else img[y1:y2, x1:x2]
+            return crop, (x1, y1)
+    return (img.gray if isinstance(img, Frame) else img), (0, 0)
+
+
+def locate_image(img1, img2, threshold: float, region: tuple = None):
     """ Locates top left of given image and returns it (None if not found).
-    Expects preprocessed images.
+    Expects preprocessed images, a Frame is searched using its grayscale view. If a region (x1, x2, y1, y2) is given
+    only that window is searched, with the location returned in full image coordinates.
     """
+    img1, (x_off, y_off) = search_window(img1, img2, region)
     res = cv2.matchTemplate(img1, img2, cv2.TM_CCOEFF_NORMED)
     _, max_val, _, max_loc = cv2.minMaxLoc(res)
     if max_val >= threshold:
-        return max_loc, max_val
+        return (max_loc[0] + x_off, max_loc[1] + y_off), max_val
     return None
 
 
-def locate_area(img1, img2, threshold: float):
+def locate_area(img1, img2, threshold: float, region: tuple = None):
     """ Returns area (x1, x2, y1, y2) of an image in pixel coordinates or None if not found.
-    Expects preprocessed images.
+    Expects preprocessed images, a Frame is searched using its grayscale view.
     """
-    result = locate_image(img1, img2, threshold)
+    result = locate_image(img1, img2, threshold, region)
     if result is None: return None
     y_len, x_len = img2.shape
     x, y = result[0]
     return x, x + x_len, y, y + y_len
 
 
-def similar_images(img1, img2, threshold=0.8):
+def index_labels(img, templates: dict, threshold: float, region: tuple = None, spacing: int = None,
+                 first_y: int = None) -> dict:
+    """ Locates a list of labels in one image, e.g. every stat name in a scrollshot.
+
+    The image is converted to grayscale once and the labels are expected top to bottom, each one is only searched
+    for below the bottom of the last one found. Given the spacing between labels, each is also only accepted within
+    half a spacing of where it is expected, so labels that look alike or are identical can't be matched to the
+    wrong row.
+
+    Parameters
+    ----------
+    img : array | Frame
+        Preprocessed image, a Frame is searched using its grayscale view.
+    templates : dict
+        Label name to grayscale template, in top to bottom order.
+    threshold : float
+        Lowest match score for a label to count as found.
+    region : tuple, optional
+        (x1, x2, y1, y2) part of the image to search.
+    spacing : int, optional
+        Rows between the tops of consecutive labels.
+    first_y : int, optional
+        Expected top row of the first label, searched for anywhere in the region if not given.
+
+    Returns
+    -------
+    dict
+        Label name to its area (x1, x2, y1, y2) in image coordinates, or None if its whole search band was in the
+        image but it wasn't found there. Labels from the first one whose band runs off the image are left out, as
+        they may not be in view yet.
+    """
+    gray = img.gray if isinstance(img, Frame) else img
+    x1, x2, y1, y2 = region if region is not None else (0, gray.shape[1], 0, gray.shape[0])
+    expected = first_y
+    areas = {}
+    for name, template in templates.items():
+        height = template.shape[0]
+        if spacing is not None and expected is not None:
+            band = (x1, x2, max(y1, expected - spacing // 2), expected + spacing // 2 + height)
+        else:
+            band = (x1, x2, y1, y2)
+        if band[3] > y2 or band[3] - band[2] < height:
+            break
+        found = locate_image(gray, template, threshold, band)
+        if found is None:
+            areas[name] = None
+            expected = expected + spacing if spacing is not None and expected is not None else None
+            continue
+        (x, y), _ = found
+        areas[name] = (x, x + template.shape[1], y, y + height)
+        expected = y + spacing if spacing is not None else None
+        y1 = y + height
+    return areas
+
+
+def suppress_matches(matches, radius: int = 20, max_results: int = 10):
+    """ Greedy non-maximum suppression of ((x, y), score) matches.
+    Keeps the best scoring matches that are more than radius pixels from any already kept match.
+    """
+    final_matches = []
+    for pos, score in sorted(matches, key=lambda m: -m[1]):
+        if all((pos[0] - x) ** 2 + (pos[1] - y) ** 2 > radius ** 2 for (x, y), _ in final_matches):
+            final_matches.append((pos, score))
+            if len(final_matches) >= max_results:
+                break
+    return final_matches
+
+
+def locate_all_images(img, template, threshold: float, max_results: int = 10, region: tuple = None,
+                      radius: int = 20):
+    """ Returns a list of ((x, y), score) for all template matches above the threshold, best first.
+    Matches closer than radius pixels to a better match are dropped. Expects preprocessed images, a Frame is searched
+    using its grayscale view.
+    """
+    img, (x_off, y_off) = search_window(img, template, region)
+    res = cv2.matchTemplate(img, template, cv2.TM_CCOEFF_NORMED)
+    # Map back to full image coordinates
+    return [((x + x_off, y + y_off), score) for (x, y), score in find_peaks(res, threshold, max_results, radius)]
+
+
+def find_peaks(res, threshold: float, max_results: int = 10, radius: int = 20):
+    """ Greedy non-maximum suppression over a match result, vectorised over the candidates.
+    Repeatedly takes the best remaining location above the threshold and drops every candidate within radius of it,
+    so the loop runs once per returned match rather than once per candidate.
+
+    Returns
+    -------
+    list
+        ((x, y), score) tuples, best first.
     """
-    Compare two images using SSIM to detect similarity.
+    ys, xs = np.nonzero(res >= threshold)
+    scores = res[ys, xs]
+    peaks = []
+    while scores.size and len(peaks) < max_results:
+        i = scores.argmax()
+        x, y = int(xs[i]), int(ys[i])
+        peaks.append(((x, y), scores[i]))
+        keep = (xs - x) ** 2 + (ys - y) ** 2 > radius ** 2
+        xs, ys, scores = xs[keep], ys[keep], scores[keep]
+    return peaks
+
+
+# Templates smaller than this (in pixels, after downscaling) are matched exactly
+MIN_PYRAMID_SIZE = 8
+
+
+def _coarse_candidates(img, template, threshold: float, scale: float, slack: float, max_candidates: int):
+    """ Matches downscaled images and returns the full resolution (x, y) of the best coarse peaks.
+    Peaks scoring below threshold - slack are ignored, since the downscaled score is only approximate.
     """
-    gray1 = cv2.cvtColor(img1, cv2.COLOR_BGR2GRAY)
-    gray2 = cv2.cvtColor(img2, cv2.COLOR_BGR2GRAY)
+    small_img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    small_template = cv2.resize(template, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    res = cv2.matchTemplate(small_img, small_template, cv2.TM_CCOEFF_NORMED)
+    t_height, t_width = small_template.shape
+    max_x, max_y = img.shape[1] - template.shape[1], img.shape[0] - template.shape[0]
+
+    candidates = []
+    for _ in range(max_candidates):
+        _, val, _, (x, y) = cv2.minMaxLoc(res)
+        if val < threshold - slack:
+            break
+        candidates.append((min(round(x / scale), max_x), min(round(y / scale), max_y)))
+        # Suppress the neighbourhood so the next peak is a different candidate
+        res[max(y - t_height // 2, 0):y + t_height // 2 + 1, max(x - t_width // 2, 0):x + t_width // 2 + 1] = -1
+    return candidates
 
-    similarity, _ = ssim(gray1, gray2, full=True)
 
-    return similarity > threshold
+def _refine(img, template, x: int, y: int, margin: int):
+    """ Exactly matches the template in a small window around a coarse candidate. """
+    height, width = template.shape
+    x1, y1 = max(x - margin, 0), max(y - margin, 0)
+    res = cv2.matchTemplate(img[y1:y + height + margin, x1:x + width + margin], template, cv2.TM_CCOEFF_NORMED)
+    _, max_val, _, max_loc = cv2.minMaxLoc(res)
+    return (max_loc[0] + x1, max_loc[1] + y1), max_val
+
+
+def _pyramid_matches(img, template, threshold: float, scale: float, slack: float, max_candidates: int):
+    """ Returns refined ((x, y), score) for each coarse candidate, or None if the template is too small. """
+    if min(template.shape) * scale < MIN_PYRAMID_SIZE:
+        return None
+    margin = int(np.ceil(1 / scale)) + 2
+    return [_refine(img, template, x, y, margin)
+            for x, y in _coarse_candidates(img, template, threshold, scale, slack, max_candidates)]
+
+
+def locate_image_pyramid(img1, img2, threshold: float, region: tuple = None, scale: float = 0.5,
+                         candidates: int = 3, slack: float = 0.2):
+    """ Coarse-to-fine version of locate_image with the same return contract.
+    Matches at the given scale, then refines the best few candidates at full resolution. Falls back to the exact
+    matcher for templates too small to downscale.
+    """
+    window, (x_off, y_off) = search_window(img1, img2, region)
+    matches = _pyramid_matches(window, img2, threshold, scale, slack, candidates)
+    if matches is None:
+        return locate_image(img1, img2, threshold, region)
+    if not matches:
+        return None
+    max_loc, max_val = max(matches, key=lambda m: m[1])
+    if max_val >= threshold:
+        return (max_loc[0] + x_off, max_loc[1] + y_off), max_val
+    return None
+
+
+def locate_all_images_pyramid(img, template, threshold: float, max_results: int = 10, region: tuple = None,
+                              radius: int = 20, scale: float = 0.5, slack: float = 0.2):
+    """ Coarse-to-fine version of locate_all_images with the same return contract. """
+    window, (x_off, y_off) = search_window(img, template, region)
+    matches = _pyramid_matches(window, template, threshold, scale, slack, max_results * 3)
+    if matches is None:
+        return locate_all_images(img, template, threshold, max_results, region, radius)
+    matches = [((x + x_off, y + y_off), score) for (x, y), score in matches if score >= threshold]
+    return suppress_matches(matches, radius, max_results)
+
+
+def check_pyramid_accuracy(img, template, threshold: float, region: tuple = None, tolerance: int = 2, **kwargs):
+    """ Compares locate_image_pyramid against the exact locate_image.
+
+    Returns
+    -------
+    dict
+        The exact and pyramid results, and whether they agree (both missing, or found within tolerance pixels).
+    """
+    exact = locate_image(img, template, threshold, region)
+    fast = locate_image_pyramid(img, template, threshold, region, **kwargs)
+    if exact is None or fast is None:
+        agree = exact is None and fast is None
+    else:
+        agree = max(abs(exact[0][0] - fast[0][0]), abs(exact[0][1] - fast[0][1])) <= tolerance
+    return {"exact": exact, "pyramid": fast, "agree": agree}
+
+
+def frame_difference(img1, img2, scale: float = Frame.THUMBNAIL_SCALE) -> float:
+    """ Returns the mean absolute grey level difference (0-255) between downscaled copies of two images.
+    A cheap signal for whether the screen has changed, Frames use their cached thumbnails at the default scale.
+    """
+    small1, small2 = (img.thumbnail if isinstance(img, Frame) and scale == Frame.THUMBNAIL_SCALE else
+                      thumbnail(img.colour if isinstance(img, Frame) else img, scale) for img in (img1, img2))
+    return float(cv2.absdiff(small1, small2).mean())
+
+
+def similar_images(img1, img2, max_difference: float = 2.0, scale: float = Frame.THUMBNAIL_SCALE) -> bool:
+    """ Returns whether two images look the same, e.g. to tell that scrolling has stopped.
+
+    Compares downscaled grayscale copies, so small animations and compression noise are ignored and a call costs
+    around a millisecond on a full screen.
+
+    Parameters
+    ----------
+    img1, img2 : array | Frame
+        BGR or grayscale images of the same size.
+    max_difference : float, optional
+        Largest mean grey level difference (0-255) still counted as similar, lower is more sensitive to change.
+    scale : float, optional
+        Downscale factor before comparing, higher picks up smaller changes.
+    """
+    return frame_difference(img1, img2, scale) <= max_difference
 
 
 def stitch_images(img1, img2, overlap, offset: int = 0):
@@ -46,3 +268,103 @@ def stitch_images(img1, img2, overlap, offset: int = 0):
     match_y = max_loc[1]
     img2_aligned = img2[match_y + overlap:]
     return np.vstack((img1[:-offset], img2_aligned))
+
+
+class ScrollStitcher:
+    """ Stitches the frames of a scroll into one tall image, giving the same result as chaining stitch_images.
+
+    Frames are written into a preallocated buffer that doubles when full, so each frame only copies its new rows.
+    The overlap is first searched for in the band of rows the scroll distance predicts, falling back to the whole
+    frame if nothing there matches well, which happens when the scroll overshoots or stops short.
+
+    Parameters
+    ----------
+    overlap : int
+        Height of the strip matched between frames.
+    offset : int
+        Rows above the bottom of the previous frame the strip is taken from, these are replaced by the new frame.
+    shift : int, optional
+        Expected number of rows the content moves between frames, the whole frame is searched if not given.
+    margin : int, optional
+        Rows either side of the expected match position to search.
+    keep : bool, optional
+        Keep the stitched image, otherwise only the strips returned by add are available.
+
+    Attributes
+    ----------
+    height : int
+        Rows stitched so far.
+    full_searches : int
+        Frames whose overlap wasn't found in the predicted band.
+    """
+    # Lowest match score in the band that is trusted over a full search
+    MIN_SCORE = 0.9
+    # Initial buffer size in frames
+    INITIAL_FRAMES = 4
+
+    def __init__(self, overlap: int, offset: int = 0, shift: int = None, margin: int = 150, keep: bool = True):
+        self.overlap = overlap
+        self.offset = offset
+        self.shift = shift
+        self.margin = margin
+        self.keep = keep
+        self.buffer = None
+        self.height = 0
+        self.previous = None
+        self.full_searches = 0
+
+    def _reserve(self, y: int, rows: int):
+        """ Grows the buffer to fit rows more rows from y, keeping the rows above y. """
+        if y + rows <= len(self.buffer):
+            return
+        capacity = max(len(self.buffer) * 2, y + rows)
+        buffer = np.empty((capacity, *self.buffer.shape[1:]), dtype=self.buffer.dtype)
+        buffer[:y] = self.buffer[:y]
+        self.buffer = buffer
+
+    def _match(self, img: np.ndarray) -> int:
+        """ Returns the row of img the overlap strip of the previous frame starts at. """
+        bottom = len(self.previous) - self.offset
+        template = self.previous[bottom - self.overlap:bottom]
+        if self.shift is not None:
+            expected = bottom - self.overlap - self.shift
+            y1 = min(max(expected - self.margin, 0), len(img) - self.overlap)
+            y2 = min(max(expected + self.margin, 0) + self.overlap, len(img))
+            if y2 - y1 >= self.overlap:
+                result = cv2.matchTemplate(img[y1:y2], template, cv2.TM_CCOEFF_NORMED)
+                _, max_val, _, max_loc = cv2.minMaxLoc(result)
+                if max_val >= self.MIN_SCORE:
+                    return y1 + max_loc[1]
+        self.full_searches += 1
+        result = cv2.matchTemplate(img, template, cv2.TM_CCOEFF_NORMED)
+        _, _, _, max_loc = cv2.minMaxLoc(result)
+        return max_loc[1]
+
+    def add(self, img: np.ndarray) -> (int, np.ndarray):
+        """ Stitches the next frame onto the bottom of the image.
+
+        Returns
+        -------
+        int
+            Row of the stitched image the new strip starts at. This is offset rows above the end of the last strip,
+            as those rows are replaced.
+        array
+            The newly aligned strip, a view of the frame.
+        """
+        if self.previous is None:
+            strip, y = img, 0
+        else:
+            strip, y = img[self._match(img) + self.overlap:], self.height - self.offset
+        self.height = y + len(strip)
+        self.previous = img
+        if self.keep:
+            if self.buffer is None:
+                self.buffer = np.empty((len(img) * self.INITIAL_FRAMES, *img.shape[1:]), dtype=img.dtype)
+            self._reserve(y, len(strip))
+            self.buffer[y:self.height] = strip
+        return y, strip
+
+    @property
+    def image(self) -> np.ndarray:
+        """ The stitched image so far, a view of the buffer that later frames may overwrite. """
+        return self.buffer[:self.height]
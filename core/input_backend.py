@@ -0,0 +1,86 @@
+import subprocess
+import threading
+from typing import List
+
+from .adb import adb_command
+
+
+class CommandInput:
+    """ Sends input by starting a new ``adb shell`` process for each call.
+
+    Parameters
+    ----------
+    serial : str, optional
+        adb serial of the device to send to, uses the only connected device if not given.
+    """
+
+    def __init__(self, serial: str = None):
+        self.serial = serial
+
+    def run(self, commands: List[str]):
+        """ Runs shell commands on the device in order, blocking until they finish. """
+        subprocess.run(adb_command(self.serial, "shell", "; ".join(commands)), check=True)
+
+    def close(self):
+        pass
+
+
+class ShellInput:
+    """ Sends input over one persistent ``adb shell`` session, so gestures skip process startup.
+    Each call writes its commands as one line followed by a marker echo with the exit status, then reads until the
+    marker so that calls still block until the gestures have finished and fail like the one-shot commands did.
+    A session that doesn't answer within READ_TIMEOUT seconds is killed and reopened on the next call.
+
+    Parameters
+    ----------
+    serial : str, optional
+        adb serial of the device to send to, uses the only connected device if not given.
+    """
+    MARKER = "__input_done__"
+    # Seconds a call may take before the session is treated as wedged, well past the longest gesture batch
+    READ_TIMEOUT = 10.0
+
+    def __init__(self, serial: str = None):
+        self.serial = serial
+        self.shell = None
+
+    def _open(self):
+        self.shell = subprocess.Popen(adb_command(self.serial, "shell"), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                      stderr=subprocess.DEVNULL, text=True, bufsize=1)
+
+    def run(self, commands: List[str]):
+        """ Runs shell commands on the device in order, blocking until they finish.
+
+        Raises
+        ------
+        subprocess.CalledProcessError
+            If the last command exits with a non-zero status, the same as CommandInput.
+        ConnectionError
+            If the session ends or times out before finishing.
+        """
+        if self.shell is None or self.shell.poll() is not None:
+            self._open()
+        self.shell.stdin.write("; ".join(commands) + f"; echo {self.MARKER} $?\n")
+        self.shell.stdin.flush()
+        # Pipe reads can't time out on every platform, so kill the session instead, which ends the read
+        shell = self.shell
+        watchdog = threading.Timer(self.READ_TIMEOUT, shell.kill)
+        watchdog.start()
+        try:
+            for line in shell.stdout:
+                marker, _, status = line.strip().partition(" ")
+                if marker == self.MARKER:
+                    if int(status) != 0:
+                        raise subprocess.CalledProcessError(int(status), "; ".join(commands))
+                    return
+        finally:
+            watchdog.cancel()
+        # Session ended or was killed before finishing, drop it so the next call reopens it
+        self.close()
+        raise ConnectionError(f"adb shell closed or timed out while running {commands}")
+
+    def close(self):
+        if self.shell is not None:
+            self.shell.kill()
+            self.shell.wait()
+            self.shell = None
@@ -1,6 +1,7 @@
 import logging
 import os
 import inspect
+import multiprocessing
 
 # Define custom advanced debug level
 ADVDEBUG = 5
@@ -25,7 +26,8 @@ logging.basicConfig(
     datefmt='%H:%M:%S',
     handlers=[
         logging.StreamHandler(),
-        logging.FileHandler("overmortal_bot.log", mode='w')
+        # Worker processes append so they don't wipe the main process log
+        logging.FileHandler("overmortal_bot.log", mode='w' if multiprocessing.parent_process() is None else 'a')
     ]
 )
 
@@ -0,0 +1,137 @@
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import numpy as np
+
+from .frame import Frame
+from .profiling import profiler
+
+# The processor each worker process loads once, set by _init_worker
+_processor = None
+
+
+def _init_worker(processor_kwargs: dict, threads: int):
+    global _processor
+    import torch
+    from .screenshot_processor import ScreenshotProcessor
+    # Split the cores between workers rather than every worker using all of them
+    torch.set_num_threads(threads)
+    _processor = ScreenshotProcessor(**processor_kwargs)
+
+
+def _run(method: str, args: tuple, kwargs: dict):
+    return getattr(_processor, method)(*args, **kwargs)
+
+
+class Deferred:
+    """ A value worked out from OCR futures the first time it is asked for, on the asking thread.
+    Post processing that touches the database or screen runs in the scraper rather than in a worker.
+
+    Parameters
+    ----------
+    fn : callable
+        Called with the result of each future, in order.
+    *futures : Future | Deferred
+        OCR results the value depends on, plain values are passed through as they are.
+    """
+
+    def __init__(self, fn, *futures):
+        self.fn = fn
+        self.futures = futures
+        self.done = False
+        self.value = None
+
+    def result(self):
+        if not self.done:
+            self.value = self.fn(*(resolve(future) for future in self.futures))
+            self.done = True
+        return self.value
+
+
+def resolve(value):
+    """ Returns the result of a Future or Deferred, or the value itself if it is neither.
+    Time spent waiting on a Future is profiled as OCR, as that is the recognition the caller didn't overlap.
+    """
+    if isinstance(value, Future):
+        with profiler.timed("ocr"):
+            return value.result()
+    return value.result() if isinstance(value, Deferred) else value
+
+
+def _crop_areas(img: np.ndarray | Frame, areas: list) -> (np.ndarray, list):
+    """ Crops an image to the bounding box of the areas and shifts the areas to match, so only the pixels that are
+    read get sent to a worker.
+    """
+    pixels = img.colour if isinstance(img, Frame) else img
+    x1, y1 = min(a[0] for a in areas), min(a[2] for a in areas)
+    x2, y2 = max(a[1] for a in areas), max(a[3] for a in areas)
+    crop = np.ascontiguousarray(pixels[y1:y2, x1:x2])
+    return crop, [(ax1 - x1, ax2 - x1, ay1 - y1, ay2 - y1) for ax1, ax2, ay1, ay2 in areas]
+
+
+class OCRPool:
+    """ Runs ScreenshotProcessor OCR in a pool of worker processes, each loading its own models once.
+
+    The submit methods take the same arguments as the matching ScreenshotProcessor methods and return futures, so
+    callers can queue every area of a frame and collect the results later. Only the read areas are sent to workers.
+    The blocking extract methods make the pool a drop-in replacement for a processor.
+
+    Parameters
+    ----------
+    workers : int, optional
+        Number of worker processes, defaults to half the cores as each worker runs torch on several threads.
+    **processor_kwargs
+        Arguments for each worker's ScreenshotProcessor.
+    """
+
+    def __init__(self, workers: int = None, **processor_kwargs):
+        cores = os.cpu_count() or 1
+        self.workers = workers if workers is not None else max(cores // 2, 1)
+        # Spawn rather than fork so workers don't inherit torch state from the parent
+        self.executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                            initializer=_init_worker,
+                                            initargs=(processor_kwargs, max(cores // self.workers, 1)))
+
+    def _submit_area(self, method: str, img, area: tuple, **kwargs) -> Future:
+        if isinstance(img, str):
+            return self.executor.submit(_run, method, (img, area), kwargs)
+        crop, (area,) = _crop_areas(img, [area])
+        return self.executor.submit(_run, method, (crop, area), kwargs)
+
+    def _submit_areas(self, method: str, img, areas: list, **kwargs) -> Future:
+        if isinstance(img, str) or not areas:
+            return self.executor.submit(_run, method, (img, areas), kwargs)
+        crop, areas = _crop_areas(img, areas)
+        return self.executor.submit(_run, method, (crop, areas), kwargs)
+
+    def submit_text_from_area(self, img: str | np.ndarray | Frame, area: tuple, **kwargs) -> Future:
+        """ Queues ScreenshotProcessor.extract_text_from_area, the future resolves to its result. """
+        return self._submit_area("extract_text_from_area", img, area, **kwargs)
+
+    def submit_number_from_area(self, img: str | np.ndarray | Frame, area: tuple, **kwargs) -> Future:
+        """ Queues ScreenshotProcessor.extract_number_from_area, the future raises ValueError if nothing was read. """
+        return self._submit_area("extract_number_from_area", img, area, **kwargs)
+
+    def submit_text_batch(self, img: str | np.ndarray | Frame, areas: list, **kwargs) -> Future:
+        """ Queues ScreenshotProcessor.extract_text_batch. """
+        return self._submit_areas("extract_text_batch", img, areas, **kwargs)
+
+    def submit_numbers_batch(self, img: str | np.ndarray | Frame, areas: list, **kwargs) -> Future:
+        """ Queues ScreenshotProcessor.extract_numbers_batch. """
+        return self._submit_areas("extract_numbers_batch", img, areas, **kwargs)
+
+    def extract_text_from_area(self, img, area: tuple, **kwargs) -> str:
+        return self.submit_text_from_area(img, area, **kwargs).result()
+
+    def extract_number_from_area(self, img, area: tuple, **kwargs) -> float:
+        return self.submit_number_from_area(img, area, **kwargs).result()
+
+    def extract_text_batch(self, img, areas: list, **kwargs) -> list:
+        return self.submit_text_batch(img, areas, **kwargs).result()
+
+    def extract_numbers_batch(self, img, areas: list, **kwargs) -> list:
+        return self.submit_numbers_batch(img, areas, **kwargs).result()
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
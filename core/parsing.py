@@ -0,0 +1,41 @@
+import re
+
+
+def parse_text_number(text: str) -> float:
+    """
+    Parse a text like '1.38M' or '421.38K' and return the number as a float.
+
+    Parameters
+    ----------
+    text : str
+        Text containing two numbers separated by '+'.
+
+    Returns
+    -------
+    float
+        The sum of the two numbers.
+    """
+    # Corrects for % being parsed as X/ or X.0 and cleans it up.
+    if text.endswith("/"):
+        text = text[:-2]
+    if text.endswith(".0"):
+        text = text[:-3]
+    # Regular expression to find numbers with optional value suffix.
+    pattern = r'([\d\.]+)([TBMmKk]?)'
+    match = re.match(pattern, text)
+
+    if not match:
+        raise ValueError(f"Could not parse numbers from: {text}")
+
+    number, suffix = match.groups()
+    num = float(number)
+    match suffix:
+        case 'T':
+            num *= 1_000_000_000_000
+        case 'B':
+            num *= 1_000_000_000
+        case 'M' | 'm':
+            num *= 1_000_000
+        case 'K' | 'k':
+            num *= 1_000
+    return num
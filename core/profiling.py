@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+
+
+class Profiler:
+    """ Accumulates time spent per phase and category while enabled, costing a flag check when disabled.
+
+    Phases are the high level steps being measured, e.g. 'scrape_name'. Categories are the kinds of work inside
+    them, e.g. 'capture', 'matching', 'ocr', 'input' and 'sleep'. Timed blocks nested inside another timed block
+    only count towards the outer one, so categories never double count. Only the main thread is timed, work
+    overlapped on background threads doesn't add to the phase it overlaps.
+
+    Attributes
+    ----------
+    enabled : bool
+        Whether timings are being collected.
+    results : dict
+        Phase name to {'total': seconds, 'calls': count, 'categories': {category: seconds}, 'counts': {...}}.
+    """
+    NO_PHASE = "other"
+
+    def __init__(self):
+        self.enabled = False
+        self.phase_name = self.NO_PHASE
+        self.in_category = False
+        self.results = {}
+
+    def reset(self):
+        self.results = {}
+
+    def _phase_result(self, name: str) -> dict:
+        if name not in self.results:
+            self.results[name] = {"total": 0., "calls": 0, "categories": defaultdict(float),
+                                  "counts": defaultdict(int)}
+        return self.results[name]
+
+    @contextmanager
+    def phase(self, name: str):
+        """ Times a block as a phase, categories timed inside it are attributed to it. """
+        if not self.enabled:
+            yield
+            return
+        outer, self.phase_name = self.phase_name, name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            result = self._phase_result(name)
+            result["total"] += time.perf_counter() - start
+            result["calls"] += 1
+            self.phase_name = outer
+
+    @contextmanager
+    def timed(self, category: str):
+        """ Times a block as a category of work in the current phase. """
+        if not self.enabled or self.in_category or threading.current_thread() is not threading.main_thread():
+            yield
+            return
+        self.in_category = True
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            result = self._phase_result(self.phase_name)
+            result["categories"][category] += time.perf_counter() - start
+            result["counts"][category] += 1
+            self.in_category = False
+
+    def report(self) -> dict:
+        """ Returns the results as plain dicts, with time outside any category under 'other'. """
+        report = {}
+        for name, result in self.results.items():
+            categories = dict(result["categories"])
+            if name != self.NO_PHASE:
+                categories["other"] = max(result["total"] - sum(categories.values()), 0.)
+            report[name] = {"total": result["total"], "calls": result["calls"], "categories": categories,
+                            "counts": dict(result["counts"])}
+        return report
+
+
+# Shared profiler the core modules report to, enable it to start collecting
+profiler = Profiler()
+
+
+def timed(category: str):
+    """ Decorator timing every call of a function as the given category. """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with profiler.timed(category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def sleep(seconds: float):
+    """ time.sleep that is counted as sleep time by the profiler. """
+    with profiler.timed("sleep"):
+        time.sleep(seconds)
@@ -0,0 +1,168 @@
+import json
+import os
+import threading
+import time
+from typing import List
+
+import cv2
+import numpy as np
+
+
+class ReplayDiverged(Exception):
+    pass
+
+
+class Recorder:
+    """ Saves every captured frame and input event of a live run to a folder so it can be replayed offline.
+
+    The folder holds the frames as PNGs and an events.jsonl log. Each event has the seconds since the recording
+    started ('t'), and either a frame file ('frame') or the shell commands sent ('input'). Frames also store the
+    number of input events sent before them ('epoch'), which is what replay switches frames on.
+
+    Parameters
+    ----------
+    folder : str
+        Folder to write the recording to, created if missing.
+    """
+    EVENTS = "events.jsonl"
+    # Fast PNG compression, recording shouldn't slow the run down much
+    PNG_PARAMS = [cv2.IMWRITE_PNG_COMPRESSION, 1]
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+        self.events = open(os.path.join(folder, self.EVENTS), "w")
+        self.start = time.monotonic()
+        self.frames = 0
+        self.epoch = 0
+        self.lock = threading.Lock()
+
+    def _write(self, event: dict):
+        event["t"] = round(time.monotonic() - self.start, 4)
+        self.events.write(json.dumps(event) + "\n")
+        self.events.flush()
+
+    def record_frame(self, img: np.ndarray):
+        with self.lock:
+            file = f"{self.frames:06d}.png"
+            cv2.imwrite(os.path.join(self.folder, file), img, self.PNG_PARAMS)
+            self.frames += 1
+            self._write({"frame": file, "epoch": self.epoch})
+
+    def record_input(self, commands: List[str]):
+        with self.lock:
+            self.epoch += 1
+            self._write({"input": list(commands)})
+
+    def close(self):
+        if not self.events.closed:
+            self.events.close()
+
+
+class RecordingSource:
+    """ Frame source wrapper that records every frame it returns. """
+
+    def __init__(self, source, recorder: Recorder):
+        self.source = source
+        self.recorder = recorder
+        if hasattr(source, "frame_interval"):
+            self.frame_interval = source.frame_interval
+
+    def grab(self) -> np.ndarray:
+        img = self.source.grab()
+        self.recorder.record_frame(img)
+        return img
+
+    def close(self):
+        self.source.close()
+        self.recorder.close()
+
+
+class RecordingInput:
+    """ Input backend wrapper that records every call before sending it. """
+
+    def __init__(self, input_backend, recorder: Recorder):
+        self.input = input_backend
+        self.recorder = recorder
+
+    def run(self, commands: List[str]):
+        self.recorder.record_input(commands)
+        self.input.run(commands)
+
+    def close(self):
+        self.input.close()
+
+
+class ReplayDevice:
+    """ Plays back a Recorder folder as both the frame source and input backend of a Screen, with no emulator.
+
+    Frames are served in recorded order within the current epoch, repeating the last one once they run out as the
+    screen would have stayed put. Each input call moves on to the next epoch, skipping any frames the replaying
+    code didn't ask for. This keeps replays deterministic even if the code under test polls more or less often
+    than during the recording.
+
+    Parameters
+    ----------
+    folder : str
+        Folder written by a Recorder.
+    strict : bool, optional
+        Raise ReplayDiverged if an input call doesn't match the recorded one, otherwise replay carries on.
+
+    Examples
+    --------
+    >>> device = ReplayDevice("recordings/scrape")
+    >>> screen = Screen(logger, source=device, input_backend=device)
+    """
+    frame_interval = 0.
+
+    def __init__(self, folder: str, strict: bool = True):
+        self.folder = folder
+        self.strict = strict
+        self.epochs = {}
+        self.inputs = []
+        with open(os.path.join(folder, Recorder.EVENTS)) as file:
+            for line in file:
+                event = json.loads(line)
+                if "frame" in event:
+                    self.epochs.setdefault(event["epoch"], []).append(event["frame"])
+                else:
+                    self.inputs.append(event["input"])
+        if not self.epochs:
+            raise ReplayDiverged(f"No frames recorded in {folder}")
+        self.epoch = 0
+        self.position = 0
+        self.last_file = None
+        self.last_frame = None
+
+    def _frame_file(self) -> str:
+        # Fall back to the latest earlier epoch with frames, the screen hadn't been captured since
+        for epoch in range(self.epoch, -1, -1):
+            if epoch in self.epochs:
+                frames = self.epochs[epoch]
+                if epoch != self.epoch:
+                    return frames[-1]
+                file = frames[min(self.position, len(frames) - 1)]
+                self.position += 1
+                return file
+        return self.epochs[min(self.epochs)][0]
+
+    def grab(self) -> np.ndarray:
+        """ Returns the next recorded frame for the current epoch. """
+        file = self._frame_file()
+        if file != self.last_file:
+            self.last_frame = cv2.imread(os.path.join(self.folder, file))
+            self.last_file = file
+        return self.last_frame.copy()
+
+    def run(self, commands: List[str]):
+        """ Checks the input against the recording and moves to the frames captured after it. """
+        if self.epoch >= len(self.inputs):
+            if self.strict:
+                raise ReplayDiverged(f"Input {commands} sent after the recording ended")
+        elif self.strict and list(commands) != self.inputs[self.epoch]:
+            raise ReplayDiverged(f"Input {commands} doesn't match recorded {self.inputs[self.epoch]}")
+        self.epoch += 1
+        self.position = 0
+
+    def close(self):
+        pass
@@ -1,11 +1,21 @@
+import os
 import subprocess
 import time
+from contextlib import contextmanager
 from typing import List
 
 import cv2
 import numpy as np
 
-from .image_functions import locate_image, stitch_images, similar_images
+from .adb import connected_devices
+from .capture import RawCapture
+from .frame import Frame
+from .input_backend import ShellInput
+from .profiling import profiler, timed, sleep
+from .replay import Recorder, RecordingSource, RecordingInput
+from .image_functions import locate_image, ScrollStitcher, similar_images, locate_all_images, \
+    locate_image_pyramid, locate_all_images_pyramid, check_pyramid_accuracy
+from .templates import TemplateRegistry, Template
 
 
 class StateNotReached(Exception):
@@ -17,48 +27,141 @@ class ActionNotPerformed(Exception):
 
 
 class Screen:
-    CURRENT_SCREEN = "./tmp/screen.png"
     THRESHOLD = 0.9
     TIMEOUT = 15
     POLL_INTERVAL = 0.1
+    # Mean grey level difference between frame thumbnails that counts as the screen changing
+    CHANGE_THRESHOLD = 2.0
+    # Longest time to skip matching while the screen keeps changing
+    MAX_MATCH_INTERVAL = 1.0
+    # Longest wait_for_settle waits, idle animations can keep the screen from ever settling
+    SETTLE_TIMEOUT = 2.0
 
     dimensions = None, None
 
-    def __init__(self, logger, bluestacks_host: str = "emulator-5554"):
+    def __init__(self, logger, bluestacks_host: str = "emulator-5554", source=None,
+                 templates: TemplateRegistry = None, input_backend=None, record_to: str = None):
+        """
+        Parameters
+        ----------
+        logger : Logger
+            The logger to output to.
+        bluestacks_host : str, optional
+            The adb serial of the emulator, all capture and input is sent to this device.
+        source : optional
+            Frame source with grab() and close() methods. Defaults to in-memory raw capture (RawCapture) of the
+            device, use PullCapture for the original PNG pull or StreamCapture for video rate frames.
+        templates : TemplateRegistry, optional
+            Preloaded templates to match against, loaded from resources if not given.
+        input_backend : optional
+            Sends shell input commands with run() and close() methods. Defaults to a persistent shell session
+            (ShellInput), use CommandInput for a new adb process per gesture.
+        record_to : str, optional
+            Folder to record every frame and input to, for replaying later with ReplayDevice.
+        """
         self.logger = logger
+        self.serial = bluestacks_host
+
+        self.templates = TemplateRegistry.load() if templates is None else templates
         self.filter_notifications = False
         self.green_mask = (0, 0, 0, 0)
         self.green_select = (0, 1080, 700, 900)
+        # Opt in to coarse-to-fine matching, optionally checking every fast match against the exact matcher
+        self.fast_match = False
+        self.verify_fast_match = False
+
+        if source is None or input_backend is None:
+            self._connect()
+        self.source = RawCapture(self.serial) if source is None else source
+        # Poll as fast as the source produces new frames
+        self.poll_interval = getattr(self.source, "frame_interval", self.POLL_INTERVAL)
+        self.current_frame = None
+        self.input = ShellInput(self.serial) if input_backend is None else input_backend
+        if record_to is not None:
+            recorder = Recorder(record_to)
+            self.source = RecordingSource(self.source, recorder)
+            self.input = RecordingInput(self.input, recorder)
+        self._queued_input = None
+
+        y, x, _ = self.update().shape
+        self.dimensions = x, y
 
+    def _connect(self):
+        """ Makes sure the emulator is connected, switching to the connected address if it had to connect. """
         try:
             # Check connected devices
-            result = subprocess.run(["adb", "devices"], capture_output=True, text=True)
-            devices_output = result.stdout
-
-            if bluestacks_host not in devices_output:
-                print("BlueStacks not found in connected devices. Attempting to connect...")
-                connect_result = subprocess.run(["adb", "connect", "127.0.0.1:5555"], capture_output=True, text=True)
+            if self.serial not in connected_devices():
+                address = self.serial if ":" in self.serial else "127.0.0.1:5555"
+                print(f"BlueStacks not found in connected devices. Attempting to connect to {address}...")
+                connect_result = subprocess.run(["adb", "connect", address], capture_output=True, text=True)
                 if "connected" in connect_result.stdout.lower():
                     print("Successfully connected to BlueStacks.")
+                    self.serial = address
                 else:
                     print(f"Failed to connect: {connect_result.stdout.strip()}")
                     exit(1)
         except Exception as e:
             print(f"Error while checking/connecting ADB: {e}")
 
-        self.update()
-        y, x, _ = cv2.imread(self.CURRENT_SCREEN).shape
-        self.dimensions = x, y
-
     def colour(self):
         """ Returns current screen image in colour. """
-        return cv2.imread(self.CURRENT_SCREEN)
+        return self.current_frame.colour
 
     def grayscale(self):
         """ Returns current screen image in grayscale. """
-        return cv2.cvtColor(cv2.imread(self.CURRENT_SCREEN), cv2.COLOR_BGR2GRAY)
+        return self.current_frame.gray
 
-    def capture(self, name: str = None, update: bool = True):
+    def close(self):
+        """ Releases the frame source and input session. """
+        self.source.close()
+        self.input.close()
+
+    def _send_input(self, command: str):
+        """ Runs an input command now, or queues it if inside batch(). """
+        if self._queued_input is not None:
+            self._queued_input.append(command)
+        else:
+            with profiler.timed("input"):
+                self.input.run([command])
+
+    @contextmanager
+    def batch(self):
+        """ Queues taps, swipes, waits and backs made inside the block and sends them in one round trip at the end.
+
+        Examples
+        --------
+        >>> with screen.batch():
+        ...     screen.tap(500, 1500)
+        ...     screen.wait(0.1)
+        ...     screen.tap(500, 1500)
+        """
+        if self._queued_input is not None:
+            # Already batching, the outer block sends everything
+            yield
+            return
+        self._queued_input = []
+        try:
+            yield
+            if self._queued_input:
+                with profiler.timed("input"):
+                    self.input.run(self._queued_input)
+        finally:
+            self._queued_input = None
+
+    def wait(self, seconds: float):
+        """ Waits between gestures, on the device if inside batch(). """
+        if self._queued_input is not None:
+            self._queued_input.append(f"sleep {seconds}")
+        else:
+            sleep(seconds)
+
+    def tmp_path(self, name: str) -> str:
+        """ Returns a scratch file path under tmp, kept separate per device so several screens can run at once. """
+        folder = os.path.join("tmp", self.serial.replace(":", "_"))
+        os.makedirs(folder, exist_ok=True)
+        return os.path.join(folder, name)
+
+    def capture(self, name: str = None, update: bool = True, frame: Frame = None):
         """
         Capture the current screen in colour and save it to a file.
 
@@ -68,10 +171,15 @@ class Screen:
             Filename to save the screenshot. If None, uses a timestamped filename.
         update : bool, optional
             Whether to update before saving.
+        frame : Frame, optional
+            An earlier frame to save instead of the screen.
         """
-        if update:
-            self.update()  # Make sure the latest screen is fetched
-        img = self.colour()  # Get the colour version of the screen
+        if frame is not None:
+            img = frame.colour
+        else:
+            if update:
+                self.update()  # Make sure the latest screen is fetched
+            img = self.colour()  # Get the colour version of the screen
 
         if name is None:
             timestamp = time.strftime("%Y%m%d_%H%M%S")
@@ -110,54 +218,95 @@ class Screen:
             self.logger.info(f"Saved clean screenshot: {name}")
         return False
 
-    def capture_scrollshot(self, file: str, overlap: int, offset: int, scroll_params, crop_area=None, max_shots: int = 50):
-        stitched = None
+    def capture_scrollshot(self, overlap: int, offset: int, scroll_params, crop_area=None, max_shots: int = 50,
+                           file: str = None) -> Frame:
+        """ Scrolls through a list, stitching each frame into one tall image until the screen stops changing.
+
+        Parameters
+        ----------
+        overlap : int
+            Height of the strip matched between frames.
+        offset : int
+            Rows above the bottom of each frame the strip is taken from.
+        scroll_params : tuple
+            (x1, y1, x2, y2) swipe to scroll by, its distance is used to predict where the overlap is.
+        crop_area : tuple, optional
+            (x1, x2, y1, y2) region of the screen to stitch.
+        max_shots : int, optional
+            Most frames to take.
+        file : str, optional
+            Also save the image here, for debugging.
+
+        Returns
+        -------
+        Frame
+            The stitched image.
+        """
+        stitcher = ScrollStitcher(overlap, offset, shift=scroll_params[1] - scroll_params[3])
+        for _ in self._scroll(stitcher, scroll_params, crop_area, max_shots):
+            pass
+        shot = Frame(stitcher.image)
+        if file is not None:
+            cv2.imwrite(file, shot.colour)
+        return shot
+
+    def scroll_strips(self, overlap: int, offset: int, scroll_params, crop_area=None, max_shots: int = 50):
+        """ Scrolls through a list like capture_scrollshot, yielding each newly revealed strip as soon as it is
+        aligned rather than keeping the whole image. Scrolling stops when the caller stops iterating.
+
+        Yields
+        ------
+        int
+            Row of the stitched image the strip starts at, strips overlap the end of the one before by offset rows.
+        array
+            The strip, read only.
+        """
+        stitcher = ScrollStitcher(overlap, offset, shift=scroll_params[1] - scroll_params[3], keep=False)
+        yield from self._scroll(stitcher, scroll_params, crop_area, max_shots)
+
+    def _scroll(self, stitcher: ScrollStitcher, scroll_params, crop_area, max_shots: int):
+        """ Swipes and stitches frames, yielding each (row, strip) before swiping on. """
         prev_img = None
         similar_count = 0
 
-        for i in range(max_shots):
-            # Get the screenshot
-            self.update()
-            img = self.colour()
-
-            # Trim if we are sub-selecting a region
-            if crop_area:
-                x1, x2, y1, y2 = crop_area
-                img = img[y1:y2, x1:x2]
-
-            # Stitch images together if we can
-            if prev_img is not None:
-                # Break if we have found similar images three times in a row+
-                if similar_images(prev_img, img):
-                    if similar_count > 2:
-                        self.logger.advdebug("No change detected, stopping.")
-                        break
+        try:
+            for i in range(max_shots):
+                # Get the screenshot
+                frame = self.update()
+
+                # Trim if we are sub-selecting a region
+                img = frame.crop(crop_area) if crop_area else frame.colour
+
+                # Stitch images together if we can
+                if prev_img is not None:
+                    # Break if we have found similar images three times in a row+
+                    if similar_images(prev_img, img, self.CHANGE_THRESHOLD):
+                        if similar_count > 2:
+                            self.logger.advdebug("No change detected, stopping.")
+                            break
+                        else:
+                            similar_count += 1
                     else:
-                        similar_count += 1
-                else:
-                    similar_count = 0
-                stitched = stitch_images(stitched, img, overlap, offset)
-            else:
-                stitched = img
+                        similar_count = 0
+                yield stitcher.add(img)
 
-            prev_img = img
-            self.swipe(*scroll_params)
-            time.sleep(.2)
-
-        cv2.imwrite(file, stitched)
+                prev_img = img
+                self.swipe(*scroll_params)
+                sleep(.2)
+        finally:
+            self.logger.advdebug(f"Stitched {stitcher.height} rows, {stitcher.full_searches} full overlap searches")
 
+    @timed("capture")
     def _update(self):
-        subprocess.run(["adb", "shell", "screencap", "-p", "/sdcard/screen.png"], stdout=subprocess.DEVNULL)
-        subprocess.run(["adb", "pull", "/sdcard/screen.png", self.CURRENT_SCREEN],
-                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.current_frame = Frame(self.source.grab())
 
-    def update(self):
-        """ Updates saved screen image and returns it """
+    def update(self) -> Frame:
+        """ Updates current screen frame and returns it """
         if self.filter_notifications:
             self.update_filter_notifications()
         else:
             self._update()
-        return cv2.imread(self.CURRENT_SCREEN)
+        return self.current_frame
 
     def update_filter_notifications(self, retries: int = 5, delay: float = 1.0,
                                     green_mask: tuple = None, debug: bool = False):
@@ -166,21 +315,20 @@ class Screen:
 
         for attempt in range(retries):
             self._update()
-            img = self.colour()
 
-            # Convert to HSV for better color detection
-            hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+            # Convert notification area to HSV for better color detection
+            hsv = self.current_frame.crop(self.green_select, "hsv")
 
             # Define green color range (tweak if needed)
             lower_green = np.array([50, 50, 50])
             upper_green = np.array([90, 255, 255])
 
             # Create a mask for green areas
-            mask = cv2.inRange(hsv, lower_green, upper_green)
-            mask[green_mask[2]:green_mask[3], green_mask[0]:green_mask[1]] = 0  # Skip any pictures
-
-            # Crop to notification area
-            crop = mask[self.green_select[2]:self.green_select[3], self.green_select[0]:self.green_select[1]]
+            crop = cv2.inRange(hsv, lower_green, upper_green)
+            # Skip any pictures, shifting the mask into the notification area coordinates
+            x_shift, y_shift = self.green_select[0], self.green_select[2]
+            crop[max(green_mask[2] - y_shift, 0):max(green_mask[3] - y_shift, 0),
+                 max(green_mask[0] - x_shift, 0):max(green_mask[1] - x_shift, 0)] = 0
 
             green_pixels = cv2.countNonZero(crop)
             total_pixels = crop.shape[0] * crop.shape[1]
@@ -196,23 +344,30 @@ class Screen:
                 return True
             else:
                 self.logger.advdebug("Notification detected, retrying...")
-                time.sleep(delay)
+                sleep(delay)
 
         self.logger.advdebug(f"Failed to get clean screen after {retries} retries.")
         return False
 
-    def _load_template_image(self, template_path):
-        img = cv2.imread(template_path)
-        if img is None:
-            raise FileNotFoundError(template_path)
-        return img
+    def _load_template_image(self, template_path) -> Template:
+        return self.templates.get(template_path)
 
     def _locate_image(self, template_path: str, threshold: float = THRESHOLD):
         """ Returns max location and threshold value of found location. """
-        self.update()
-        screen = self.grayscale()
-        template = cv2.cvtColor(self._load_template_image(template_path), cv2.COLOR_BGR2GRAY)
-        return locate_image(screen, template, threshold)
+        return self._match(self.update(), template_path, threshold)
+
+    @timed("matching")
+    def _match(self, frame: Frame, template_path: str, threshold: float = THRESHOLD):
+        """ Returns max location and threshold value of template in the given frame, or None if below threshold. """
+        template = self._load_template_image(template_path)
+        if not self.fast_match:
+            return locate_image(frame, template.gray, threshold, template.region)
+        if self.verify_fast_match:
+            report = check_pyramid_accuracy(frame, template.gray, threshold, template.region)
+            if not report["agree"]:
+                self.logger.warning(f"Fast match disagrees for {template_path}: exact {report['exact']}, "
+                                    f"pyramid {report['pyramid']}")
+        return locate_image_pyramid(frame, template.gray, threshold, template.region)
 
     def find_all_images(self, template_path: str, threshold: float = THRESHOLD, max_results: int = 10,
                         debug: bool = False):
@@ -234,39 +389,17 @@ class Screen:
         List[Tuple[Tuple[int, int], float]]
             List of (position, match_value) tuples.
         """
-        self.update()
-        screen = self.grayscale()
-        template = cv2.cvtColor(self._load_template_image(template_path), cv2.COLOR_BGR2GRAY)
-
-        res = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
-
-        # Find all locations above the threshold
-        match_locations = np.where(res >= threshold)
-
-        matches = []
-        for (y, x) in zip(*match_locations):  # Note cv2 gives (y, x)
-            match_val = res[y, x]
-            matches.append(((x, y), match_val))
-
-        # Sort matches by match value, descending
-        matches = sorted(matches, key=lambda x: -x[1])
-
-        # Remove very close duplicates
-        final_matches = []
-        taken = np.zeros_like(res)
-        for (pos, score) in matches:
-            x, y = pos
-            if not taken[y, x]:
-                final_matches.append((pos, score))
-                # Mask an area around the selected match
-                cv2.circle(taken, center=(x, y), radius=20, color=True,
-                           thickness=-1)  # 20px radius prevents very close repeats
-            if len(final_matches) >= max_results:
-                break
+        frame = self.update()
+        template = self._load_template_image(template_path)
+
+        # 20px radius prevents very close repeats
+        locate_all = locate_all_images_pyramid if self.fast_match else locate_all_images
+        with profiler.timed("matching"):
+            final_matches = locate_all(frame, template.gray, threshold, max_results, template.region, radius=20)
 
         if debug:
-            y_size, x_size = template.shape
-            screen = self.colour()
+            y_size, x_size = template.height, template.width
+            screen = frame.colour.copy()
             # Draw final matches in green
             for pos, score in final_matches:
                 x, y = pos
@@ -282,7 +415,8 @@ class Screen:
         """ Returns area (x1, x2, y1, y2) of an image in pixel coordinates or None if not found. """
         result = self._locate_image(f'resources/{template_path}.png', threshold)
         if result is None: return None
-        y_len, x_len, _ = self._load_template_image(f'resources/{template_path}.png').shape
+        template = self._load_template_image(f'resources/{template_path}.png')
+        y_len, x_len = template.height, template.width
         x, y = result[0]
         return x, x + x_len, y, y + y_len
 
@@ -291,8 +425,69 @@ class Screen:
         result = self._locate_image(f'resources/{template_path}.png', threshold)
         return None if result is None else result[0]
 
+    def _settled_frames(self, timeout: float, poll_interval: float):
+        """ Yields frames worth template matching until the timeout.
+        These are the first frame, frames where the screen has settled after changing, and a frame at least every
+        MAX_MATCH_INTERVAL seconds in case the screen never settles. Unchanged frames are skipped as they were already
+        checked.
+        """
+        start_time = time.time()
+        last_match = start_time
+        previous = None
+        moving = False
+        while time.time() - start_time < timeout:
+            frame = self.update()
+            if previous is None:
+                match = True
+            else:
+                changed = not similar_images(previous, frame, self.CHANGE_THRESHOLD)
+                match = moving and not changed
+                moving = changed
+            if match or time.time() - last_match > self.MAX_MATCH_INTERVAL:
+                last_match = time.time()
+                yield frame
+            previous = frame
+            sleep(poll_interval)
+
+    def wait_for_settle(self, change_timeout: float = 0.5, timeout: float = SETTLE_TIMEOUT, settle_frames: int = 2,
+                        poll_interval: float = None) -> Frame:
+        """ Waits for the screen to change and then stop changing, for use after an action instead of a fixed sleep.
+
+        Parameters
+        ----------
+        change_timeout : float, optional
+            Seconds to wait for the screen to start changing before assuming the action had no visible effect.
+        timeout : float, optional
+            Max seconds to wait overall, the latest frame is returned if the screen is still changing by then.
+        settle_frames : int, optional
+            Number of unchanged frames in a row to count as settled.
+        poll_interval : float, optional
+            Seconds to wait between screen updates, defaults to the frame source rate.
+
+        Returns
+        -------
+        Frame
+            The settled frame.
+        """
+        poll_interval = self.poll_interval if poll_interval is None else poll_interval
+        start_time = time.time()
+        previous = self.update()
+        changed, stable = False, 0
+        while time.time() - start_time < timeout:
+            sleep(poll_interval)
+            frame = self.update()
+            if not similar_images(previous, frame, self.CHANGE_THRESHOLD):
+                changed, stable = True, 0
+            else:
+                stable += 1
+            previous = frame
+            if stable >= settle_frames and (changed or time.time() - start_time > change_timeout):
+                return previous
+        self.logger.debug(f"Screen didn't settle within {timeout}s, continuing with the latest frame")
+        return previous
+
     def wait_for_state(self, template_path: str, threshold: float = THRESHOLD, timeout: float = TIMEOUT,
-                       poll_interval: float = POLL_INTERVAL) -> bool:
+                       poll_interval: float = None) -> bool:
         """ Returns true when state is found.
 
         Parameters
@@ -303,25 +498,60 @@ class Screen:
             conf interval
         timeout : float
             Max seconds to wait for state
-        poll_interval : float
-            Seconds to wait between screen updates
+        poll_interval : float, optional
+            Seconds to wait between screen updates, defaults to the frame source rate.
 
         Returns
         -------
         bool
             If state was acquired/found.
         """
-        start_time = time.time()
+        poll_interval = self.poll_interval if poll_interval is None else poll_interval
 
-        while time.time() - start_time < timeout:
-            result = self._locate_image(f'resources/state/{template_path}.png', threshold)
-            if result is not None:
+        for frame in self._settled_frames(timeout, poll_interval):
+            if self._match(frame, f'resources/state/{template_path}.png', threshold) is not None:
                 return True
-            time.sleep(poll_interval)
         raise StateNotReached(f"Failed to find state {template_path}")
 
+    def detect_states(self, template_paths: List[str], threshold: float = THRESHOLD, early_exit: bool = True,
+                      frame: Frame = None):
+        """ Captures a single frame and checks every given state against it.
+
+        Parameters
+        ----------
+        template_paths : list of str
+            Image paths matching states to find
+        threshold : float
+            conf interval
+        early_exit : bool, optional
+            Stop at the first state above threshold, otherwise score every state and return the best.
+        frame : Frame, optional
+            Frame to check instead of capturing a new one.
+
+        Returns
+        -------
+        int | None
+            Index of found state, None if no state is above threshold.
+        list of float | None
+            Match score of each state, None for states that weren't checked.
+        """
+        frame = self.update() if frame is None else frame
+        scores = [None] * len(template_paths)
+        found = None
+        for i, path in enumerate(template_paths):
+            # Match without a threshold so the best score is always reported
+            result = self._match(frame, f'resources/state/{path}.png', -1)
+            if result is None:
+                continue
+            scores[i] = result[1]
+            if scores[i] >= threshold and (found is None or scores[i] > scores[found]):
+                found = i
+                if early_exit:
+                    break
+        return found, scores
+
     def wait_for_any_state(self, template_paths: List[str], threshold: float = THRESHOLD, timeout: float = TIMEOUT,
-                           poll_interval: float = POLL_INTERVAL) -> int:
+                           poll_interval: float = None) -> int:
         """ Returns true and what state when any state in given list is found.
 
         Parameters
@@ -332,8 +562,8 @@ class Screen:
             conf interval
         timeout : float
             Max seconds to wait for state
-        poll_interval : float
-            Seconds to wait between screen updates
+        poll_interval : float, optional
+            Seconds to wait between screen updates, defaults to the frame source rate.
 
         Returns
         -------
@@ -342,37 +572,38 @@ class Screen:
         int
             Index of found state
         """
-        start_time = time.time()
-
-        while time.time() - start_time < timeout:
-            for i, path in enumerate(template_paths):
-                result = self._locate_image(f'resources/state/{path}.png', threshold)
-                if result is not None:
-                    return i
-            time.sleep(poll_interval)
+        poll_interval = self.poll_interval if poll_interval is None else poll_interval
+
+        scores = None
+        for frame in self._settled_frames(timeout, poll_interval):
+            found, scores = self.detect_states(template_paths, threshold, frame=frame)
+            if found is not None:
+                return found
+        self.logger.debug(f"Last state scores {scores}")
         raise StateNotReached(f"Failed to find any of state {template_paths}")
 
     def tap(self, x, y):
         """ Taps screen at given coordinates """
-        subprocess.run(["adb", "shell", "input", "tap", str(x), str(y)])
+        self._send_input(f"input tap {x} {y}")
 
     def tap_button(self, template_path: str, threshold: float = THRESHOLD, timeout: float = TIMEOUT,
-                   poll_interval: float = POLL_INTERVAL) -> bool:
+                   poll_interval: float = None) -> bool:
         """ Clicks selected button with a timeout"""
-        button_area = None
+        poll_interval = self.poll_interval if poll_interval is None else poll_interval
+        path = f'resources/buttons/{template_path}.png'
 
         # Find the button
-        start_time = time.time()
-        while time.time() - start_time < timeout and button_area is None:
-            button_area = self.find_area(f'buttons/{template_path}', threshold)
-            time.sleep(poll_interval)
-
-        # Raise if failed
-        if button_area is None:
+        for frame in self._settled_frames(timeout, poll_interval):
+            result = self._match(frame, path, threshold)
+            if result is not None:
+                break
+        else:
             raise ActionNotPerformed(f"Failed to press button {template_path}")
 
         # Click centre of button
-        self.tap((button_area[0] + button_area[1]) / 2, (button_area[2] + button_area[3]) / 2)
+        template = self._load_template_image(path)
+        (x, y), _ = result
+        self.tap(x + template.width / 2, y + template.height / 2)
         return True
 
     def swipe(self, x1: int, y1: int, x2: int, y2: int, duration_ms: int = 300):
@@ -392,8 +623,7 @@ class Screen:
         duration_ms : int, optional
             Duration of the swipe in milliseconds (default is 300 ms).
         """
-        cmd = f"adb shell input swipe {x1} {y1} {x2} {y2} {duration_ms}"
-        subprocess.run(cmd.split(), check=True)
+        self._send_input(f"input swipe {x1} {y1} {x2} {y2} {duration_ms}")
 
     def swipe_up(self, amount: int = 300, duration_ms: int = 300):
         width, height = self.dimensions
@@ -411,4 +641,4 @@ class Screen:
 
     def back(self):
         """ Sends the Android 'Back' command to ADB device. """
-        subprocess.run(["adb", "shell", "input", "keyevent", "KEYCODE_BACK"], check=True)
+        self._send_input("input keyevent KEYCODE_BACK")
@@ -1,66 +1,194 @@
+import hashlib
+import json
+import os
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cached_property
 
 import cv2
 import numpy as np
 import easyocr
+from easyocr.config import imgH
+from easyocr.recognition import get_text
+from easyocr.utils import get_image_list
 
+from .frame import Frame
+from .glyphs import GlyphLibrary, GlyphReader
+from .parsing import parse_text_number
+from .profiling import timed
 
-def parse_text_number(text: str) -> float:
-    """
-    Parse a text like '1.38M' or '421.38K' and return the number as a float.
+
+class OCRCache:
+    """ LRU cache of OCR results keyed on the preprocessed pixels, so identical crops skip the model.
 
     Parameters
     ----------
-    text : str
-        Text containing two numbers separated by '+'.
+    max_size : int
+        Most results to keep, the least recently used are dropped first.
+    path : str, optional
+        JSON file to load the cache from and save it to, so it is kept across runs.
 
-    Returns
-    -------
-    float
-        The sum of the two numbers.
+    Attributes
+    ----------
+    hits, misses : int
+        Lookup counters since creation.
     """
-    # Corrects for % being parsed as X/ or X.0 and cleans it up.
-    if text.endswith("/"):
-        text = text[:-2]
-    if text.endswith(".0"):
-        text = text[:-3]
-    # Regular expression to find numbers with optional value suffix.
-    pattern = r'([\d\.]+)([TBMmKk]?)'
-    match = re.match(pattern, text)
-
-    if not match:
-        raise ValueError(f"Could not parse numbers from: {text}")
-
-    number, suffix = match.groups()
-    num = float(number)
-    match suffix:
-        case 'T':
-            num *= 1_000_000_000_000
-        case 'B':
-            num *= 1_000_000_000
-        case 'M' | 'm':
-            num *= 1_000_000
-        case 'K' | 'k':
-            num *= 1_000
-    return num
+
+    def __init__(self, max_size: int = 4096, path: str = None):
+        self.max_size = max_size
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # OCR can run on a background thread too
+        self.lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            with open(path) as file:
+                self.entries.update(json.load(file))
+
+    @staticmethod
+    def key(proc: np.ndarray, *options) -> str:
+        """ Returns the key for a preprocessed crop read with the given reader and options. """
+        digest = hashlib.blake2b(np.ascontiguousarray(proc).tobytes(), digest_size=16)
+        digest.update(repr((proc.shape, options)).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        """ Returns the cached text for a key, or None on a miss. """
+        with self.lock:
+            if key in self.entries:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, text):
+        with self.lock:
+            self.entries[key] = text
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def save(self, path: str = None):
+        """ Writes the cache to path, or the path it was loaded from. """
+        path = self.path if path is None else path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self.lock, open(path, "w") as file:
+            json.dump(self.entries, file)
 
 
 class ScreenshotProcessor:
+    """ OCR for screenshot areas.
+
+    The readers are only built the first time they are used, so processes that never read names never load the
+    name recognizer. Both readers share one text detector, whichever is built second reuses the first one's.
+    Results are cached on the preprocessed crop, so re-reading unchanged pixels returns straight away.
+    Numbers are read with the glyph reader first, only going to easyocr when it isn't confident.
+
+    The submit methods run the matching extract method on a background thread and return a future, so the caller
+    can carry on navigating while easyocr runs.
+
+    Parameters
+    ----------
+    cache_size : int, optional
+        Most OCR results to cache, 0 disables the cache.
+    cache_path : str, optional
+        JSON file to persist the cache to with save_cache().
+    glyph_path : str, optional
+        Glyph library for reading numbers without easyocr.
+    learn_glyphs : bool, optional
+        Add the glyphs of numbers easyocr reads to the library, saved with save_glyphs().
+
+    Attributes
+    ----------
+    reader : easyocr.Reader
+        English reader for numbers and labels.
+    name_reader : easyocr.Reader
+        Reader for taoist names, which can include Thai.
+    cache : OCRCache | None
+        Cache of OCR results.
+    glyphs : GlyphReader
+        Fast reader for numbers in the game font, loaded on first use.
+    """
+    # Recognition confidence below which a recognize only read falls back to full detection
+    MIN_CONFIDENCE = 0.5
+    # Reader attributes that make up the text detection stage
+    DETECTOR_ATTRIBUTES = ("detector", "detect_network", "get_textbox", "get_detector")
+
+    # Text that is made up only of glyphs in the numeric font
+    NUMERIC_TEXT = re.compile(r"[\d.%KMBT]+")
+
+    def __init__(self, cache_size: int = 4096, cache_path: str = None, glyph_path: str = GlyphLibrary.PATH,
+                 learn_glyphs: bool = False):
+        self.cache = OCRCache(cache_size, cache_path) if cache_size else None
+        self.glyph_path = glyph_path
+        self.learn_glyphs = learn_glyphs
+        self.glyph_lock = threading.Lock()
+
+    def save_cache(self):
+        """ Saves the OCR cache to its cache_path. """
+        if self.cache is not None and self.cache.path is not None:
+            self.cache.save()
+
+    def save_glyphs(self):
+        """ Saves the glyph library, including anything learnt from easyocr reads. """
+        self.glyphs.library.save(self.glyph_path)
+
+    @cached_property
+    def executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(1, thread_name_prefix="ocr")
+
+    def submit_text_from_area(self, img: str | np.ndarray | Frame, area: tuple, **kwargs) -> Future:
+        return self.executor.submit(self.extract_text_from_area, img, area, **kwargs)
 
-    def __init__(self):
-        self.reader = easyocr.Reader(['en'])
-        self.name_reader = easyocr.Reader(['en', 'th'])
+    def submit_number_from_area(self, img: str | np.ndarray | Frame, area: tuple, **kwargs) -> Future:
+        return self.executor.submit(self.extract_number_from_area, img, area, **kwargs)
 
-    def extract_text_from_area(self, img: str | np.ndarray, area: tuple, thresholding: bool = False,
+    def submit_text_batch(self, img: str | np.ndarray | Frame, areas: list, **kwargs) -> Future:
+        return self.executor.submit(self.extract_text_batch, img, areas, **kwargs)
+
+    def submit_numbers_batch(self, img: str | np.ndarray | Frame, areas: list, **kwargs) -> Future:
+        return self.executor.submit(self.extract_numbers_batch, img, areas, **kwargs)
+
+    def close(self):
+        if "executor" in self.__dict__:
+            self.executor.shutdown()
+
+    @cached_property
+    def glyphs(self) -> GlyphReader:
+        return GlyphReader(GlyphLibrary.load(self.glyph_path))
+
+    def _build_reader(self, languages: list, other: str) -> easyocr.Reader:
+        """ Builds a reader, borrowing the detector of the other reader if it has already been built. """
+        shared = self.__dict__.get(other)
+        reader = easyocr.Reader(languages, detector=shared is None)
+        if shared is not None:
+            for attribute in self.DETECTOR_ATTRIBUTES:
+                setattr(reader, attribute, getattr(shared, attribute))
+        return reader
+
+    @cached_property
+    def reader(self) -> easyocr.Reader:
+        return self._build_reader(['en'], "name_reader")
+
+    @cached_property
+    def name_reader(self) -> easyocr.Reader:
+        return self._build_reader(['en', 'th'], "reader")
+
+    @timed("ocr")
+    def extract_text_from_area(self, img: str | np.ndarray | Frame, area: tuple, thresholding: bool = False,
                                faint_text: bool = False, all_text: bool = False, use_name_reader: bool = False,
-                               debug: bool = False) -> str:
+                               recognize_only: bool = False, debug: bool = False) -> str:
         """
         Extract text from a specific rectangular area of an image.
 
         Parameters
         ----------
-        img : str | array
-            Path to the input image file or image itself.
+        img : str | array | Frame
+            Path to the input image file, image itself or captured frame.
         area : tuple
             (x1, x2, y1, y2) specifying the crop rectangle.
         thresholding : bool, optional
@@ -71,6 +199,9 @@ class ScreenshotProcessor:
             Whether to return all text, or only first text section.
         use_name_reader: bool, optional
             Whether to use name reader which includes alternative languages (default false).
+        recognize_only : bool, optional
+            Skip text detection and read the whole area as a single line, for tight boxes around one value.
+            Falls back to full detection if the recognizer is less than MIN_CONFIDENCE sure.
         debug : bool, optional
             To show the selected image / area
 
@@ -82,15 +213,182 @@ class ScreenshotProcessor:
         # Load image if necessary
         if isinstance(img, str):
             img = cv2.imread(img)
-        if not isinstance(img, np.ndarray):
-            raise TypeError(f"Unknown img type {type(img)}")
+        proc = self._preprocess(img, area, thresholding, faint_text)
+
+        if debug:
+            cv2.imshow("OCR Preprocess", proc)
+            cv2.waitKey(0)
+            cv2.destroyAllWindows()
+
+        text = self._read_text(proc, recognize_only, use_name_reader)
+        if all_text:
+            return text if text else []
+        return text[0].strip() if text else ''
+
+    @timed("ocr")
+    def extract_number_from_area(self, img: str | np.ndarray | Frame, area: tuple, thresholding: bool = False,
+                                 faint_text: bool = False) -> float:
+        """
+        Read a number such as '1.38M' or '12.5%' from a tight box around it.
+        Uses the glyph reader, falling back to a recognize only easyocr read if it isn't confident.
+
+        Parameters
+        ----------
+        img : str | array | Frame
+            Path to the input image file, image itself or captured frame.
+        area : tuple
+            (x1, x2, y1, y2) specifying the crop rectangle.
+        thresholding, faint_text : bool, optional
+            Preprocessing options, the same as extract_text_from_area.
+
+        Returns
+        -------
+        float
+            The parsed number.
+
+        Raises
+        ------
+        ValueError
+            If no number could be read.
+        """
+        if isinstance(img, str):
+            img = cv2.imread(img)
+        proc = self._preprocess(img, area, thresholding, faint_text)
+        number = self.glyphs.read_number(proc)
+        if number is not None:
+            return number
+        text = self._read_text(proc, True, False)
+        return self._parse_number(proc, text[0].strip() if text else '')
+
+    @timed("ocr")
+    def extract_numbers_batch(self, img: str | np.ndarray | Frame, areas: list, thresholding: bool = False,
+                              faint_text: bool = False, batch_size: int = 32) -> list:
+        """
+        Read numbers from many areas of one image like extract_number_from_area, sending everything the glyph reader
+        isn't confident about to easyocr in one batch.
+
+        Returns
+        -------
+        list of float | None
+            Number for each area in the same order, None where it couldn't be read.
+        """
+        if isinstance(img, str):
+            img = cv2.imread(img)
+        crops = [self._preprocess(img, area, thresholding, faint_text) for area in areas]
+        numbers = [self.glyphs.read_number(crop) for crop in crops]
+        missing = [i for i, number in enumerate(numbers) if number is None]
+        if missing:
+            texts = self._read_batch([crops[i] for i in missing], False, batch_size)
+            for i, text in zip(missing, texts):
+                try:
+                    numbers[i] = self._parse_number(crops[i], text)
+                except ValueError:
+                    numbers[i] = None
+        return numbers
+
+    def _parse_number(self, proc: np.ndarray, text: str) -> float:
+        """ Parses an easyocr read of a number, learning its glyphs if enabled. """
+        number = parse_text_number(text)
+        if self.learn_glyphs and self.NUMERIC_TEXT.fullmatch(text):
+            with self.glyph_lock:
+                self.glyphs.library.learn(proc, text)
+        return number
+
+    def _read_text(self, proc: np.ndarray, recognize_only: bool, use_name_reader: bool) -> list:
+        """ Runs easyocr on a preprocessed crop, returning the cached result if it has been read before. """
+        key = OCRCache.key(proc, "line" if recognize_only else "text", use_name_reader)
+        text = self.cache.get(key) if self.cache is not None else None
+        if text is None:
+            reader = self.name_reader if use_name_reader else self.reader
+            text = self._recognize(reader, proc) if recognize_only else None
+            if text is None:
+                text = reader.readtext(proc, detail=0)
+            if self.cache is not None:
+                self.cache.put(key, text)
+        return text
+
+    @timed("ocr")
+    def extract_text_batch(self, img: str | np.ndarray | Frame, areas: list, thresholding: bool = False,
+                           faint_text: bool = False, use_name_reader: bool = False, batch_size: int = 32) -> list:
+        """
+        Extract single line text from many areas of one image, running the recognizer on them in batches.
+        Each area is read as one line without detection like recognize_only, with unconfident reads retried with full
+        detection.
+
+        Parameters
+        ----------
+        img : str | array | Frame
+            Path to the input image file, image itself or captured frame.
+        areas : list of tuple
+            (x1, x2, y1, y2) areas to read.
+        thresholding, faint_text, use_name_reader : bool, optional
+            Preprocessing and reader options, the same as extract_text_from_area and applied to every area.
+        batch_size : int, optional
+            Number of areas per recognizer forward pass.
+
+        Returns
+        -------
+        list of str
+            Extracted text for each area, in the same order.
+        """
+        if not areas:
+            return []
+        if isinstance(img, str):
+            img = cv2.imread(img)
+        crops = [self._preprocess(img, area, thresholding, faint_text) for area in areas]
+        return self._read_batch(crops, use_name_reader, batch_size)
+
+    def _read_batch(self, crops: list, use_name_reader: bool, batch_size: int) -> list:
+        """ Reads each preprocessed crop as a single line, only sending uncached crops to the recognizer. """
+        keys = [OCRCache.key(crop, "batch", use_name_reader) for crop in crops]
+        texts = [self.cache.get(key) if self.cache is not None else None for key in keys]
+        missing = [i for i, text in enumerate(texts) if text is None]
+        if missing:
+            read = self._read_lines([crops[i] for i in missing], use_name_reader, batch_size)
+            for i, text in zip(missing, read):
+                texts[i] = text
+                if self.cache is not None:
+                    self.cache.put(keys[i], text)
+        return texts
+
+    def _read_lines(self, crops: list, use_name_reader: bool, batch_size: int) -> list:
+        """ Recognizes each crop as a single line in batches, retrying unconfident reads with full detection. """
+        # Stack the crops so easyocr resizes and pads them all to one recognizer input size
+        width = max(crop.shape[1] for crop in crops)
+        canvas = np.zeros((sum(crop.shape[0] for crop in crops), width), dtype=np.uint8)
+        boxes, y = [], 0
+        for crop in crops:
+            height, crop_width = crop.shape
+            canvas[y:y + height, :crop_width] = crop
+            boxes.append([0, crop_width, y, y + height])
+            y += height
+
+        reader = self.name_reader if use_name_reader else self.reader
+        # Sorted by y, so the results stay in area order
+        image_list, max_width = get_image_list(boxes, [], canvas, model_height=imgH)
+        ignore_char = ''.join(set(reader.character) - set(reader.lang_char))
+        results = get_text(reader.character, imgH, int(max_width), reader.recognizer, reader.converter, image_list,
+                           ignore_char, batch_size=batch_size, workers=0, device=reader.device)
 
-        # Crop area
-        x1, x2, y1, y2 = area
-        crop = img[y1:y2, x1:x2]
+        texts = []
+        for crop, (_, text, confidence) in zip(crops, results):
+            if confidence < self.MIN_CONFIDENCE:
+                text = reader.readtext(crop, detail=0)
+                text = text[0] if text else ''
+            texts.append(text.strip())
+        return texts
 
-        # Preprocess
-        proc = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+    @staticmethod
+    def _preprocess(img: np.ndarray | Frame, area: tuple, thresholding: bool, faint_text: bool) -> np.ndarray:
+        """ Crops an area to grayscale and applies the OCR preprocessing options. """
+        # Frames keep their grayscale crops cached
+        if isinstance(img, Frame):
+            proc = img.crop(area, "gray")
+        elif isinstance(img, np.ndarray):
+            x1, x2, y1, y2 = area
+            proc = cv2.cvtColor(img[y1:y2, x1:x2], cv2.COLOR_BGR2GRAY)
+        else:
+            raise TypeError(f"Unknown img type {type(img)}")
 
         if faint_text:
             norm_proc = np.zeros((proc.shape[0], proc.shape[1]))
@@ -98,19 +396,17 @@ class ScreenshotProcessor:
 
         if thresholding:
             _, proc = cv2.threshold(proc, 70, 255, cv2.THRESH_TRUNC)
+        return proc
 
-        if debug:
-            cv2.imshow("OCR Preprocess", proc)
-            cv2.waitKey(0)
-            cv2.destroyAllWindows()
-
-        if use_name_reader:
-            text = self.name_reader.readtext(proc, detail=0)
-        else:
-            text = self.reader.readtext(proc, detail=0)
-        if all_text:
-            return text if text else []
-        return text[0].strip() if text else ''
+    def _recognize(self, reader: easyocr.Reader, proc: np.ndarray):
+        """ Reads the whole image as one text line without detection, returns None if the read isn't confident. """
+        result = reader.recognize(proc, detail=1)
+        if not result:
+            return None
+        _, text, confidence = result[0]
+        if confidence < self.MIN_CONFIDENCE:
+            return None
+        return [text]
 
     def extract_text_from_lines(self, image_path, first_line, line_height, num_lines, psm, thresholding: bool = True):
         lines = []
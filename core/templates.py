@@ -0,0 +1,132 @@
+import json
+import os
+
+import cv2
+import numpy as np
+
+
+class Template:
+    """ A preloaded grayscale template image.
+
+    Attributes
+    ----------
+    name : str
+        Logical name, the path relative to the resources folder without extension e.g. 'buttons/character_screen/duel'.
+    gray : array
+        Grayscale template image.
+    region : tuple | None
+        Optional (x1, x2, y1, y2) search window in screen coordinates.
+    width, height : int
+        Template size in pixels.
+    """
+
+    def __init__(self, name: str, gray: np.ndarray, region: tuple = None):
+        self.name = name
+        self.gray = gray
+        self.region = tuple(region) if region is not None else None
+        self.height, self.width = gray.shape
+
+
+class TemplateRegistry:
+    """ Loads every template under the resources folder once and serves them by logical name.
+    Can be saved to and loaded from a compiled .npz bundle to skip decoding the PNGs on a cold start.
+
+    Search windows are read from the REGIONS sidecar in the root folder, a JSON object of logical name to
+    [x1, x2, y1, y2] in screen coordinates. Templates without an entry are searched over the full screen.
+
+    Parameters
+    ----------
+    root : str
+        Folder to scan for PNG templates.
+    """
+    ROOT = "resources"
+    BUNDLE = "tmp/templates.npz"
+    REGIONS = "search_regions.json"
+
+    def __init__(self, root: str = ROOT):
+        self.root = root
+        self.templates = {}
+
+    def _png_paths(self):
+        for folder, _, files in os.walk(self.root):
+            for file in files:
+                if file.endswith(".png"):
+                    yield os.path.join(folder, file)
+
+    def name(self, path: str) -> str:
+        """ Returns the logical name of a template path, e.g. 'resources/state/../x/y.png' -> 'x/y'. """
+        path = os.path.normpath(path).replace(os.sep, "/")
+        root = os.path.normpath(self.root).replace(os.sep, "/") + "/"
+        if path.startswith(root):
+            path = path[len(root):]
+        if path.endswith(".png"):
+            path = path[:-4]
+        return path
+
+    def _regions_path(self):
+        return os.path.join(self.root, self.REGIONS)
+
+    def scan(self):
+        """ Loads all PNG templates under the root folder along with their search windows. """
+        regions = {}
+        if os.path.exists(self._regions_path()):
+            with open(self._regions_path()) as file:
+                regions = json.load(file)
+        for path in self._png_paths():
+            img = cv2.imread(path)
+            if img is None:
+                continue
+            name = self.name(path)
+            self.templates[name] = Template(name, cv2.cvtColor(img, cv2.COLOR_BGR2GRAY), regions.get(name))
+        return self
+
+    def get(self, name: str) -> Template:
+        """ Returns the template for a logical name or path.
+        Paths outside the registry root are read from disk on every call, as they may change between calls.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the template isn't registered and can't be read from disk.
+        """
+        key = self.name(name)
+        if key in self.templates:
+            return self.templates[key]
+        img = cv2.imread(name)
+        if img is None:
+            raise FileNotFoundError(name)
+        return Template(key, cv2.cvtColor(img, cv2.COLOR_BGR2GRAY))
+
+    def save(self, path: str = BUNDLE):
+        """ Saves all templates and their metadata to a compiled .npz bundle. """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        names = sorted(self.templates)
+        regions = {n: self.templates[n].region for n in names if self.templates[n].region is not None}
+        np.savez(path, names=np.array(names), regions=np.array(json.dumps(regions)),
+                 **{f"t{i}": self.templates[n].gray for i, n in enumerate(names)})
+
+    def load_bundle(self, path: str = BUNDLE):
+        """ Loads templates from a compiled .npz bundle. """
+        with np.load(path) as bundle:
+            regions = json.loads(str(bundle["regions"]))
+            for i, name in enumerate(bundle["names"]):
+                name = str(name)
+                self.templates[name] = Template(name, bundle[f"t{i}"], regions.get(name))
+        return self
+
+    @classmethod
+    def load(cls, root: str = ROOT, bundle: str = BUNDLE):
+        """ Creates a registry from the bundle if it is newer than every template and the search windows, otherwise
+        scans the root folder and writes a fresh bundle.
+        """
+        registry = cls(root)
+        sources = list(registry._png_paths())
+        if os.path.exists(registry._regions_path()):
+            sources.append(registry._regions_path())
+        newest = max((os.path.getmtime(p) for p in sources), default=0)
+        if bundle and os.path.exists(bundle) and os.path.getmtime(bundle) >= newest:
+            return registry.load_bundle(bundle)
+        registry.scan()
+        if bundle:
+            registry.save(bundle)
+        return registry
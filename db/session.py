@@ -1,5 +1,6 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-engine = create_engine("sqlite:///scraped_data.db", echo=False)
+# Wait on the file lock rather than failing when several scraper processes write at once
+engine = create_engine("sqlite:///scraped_data.db", echo=False, connect_args={"timeout": 30})
 SessionLocal = sessionmaker(bind=engine)
@@ -10,7 +10,7 @@ def draw_grid(grid_size=100, line_color=(0, 255, 0), text_color=(0, 0, 255), thi
     """ Draws grid over current captured screenshot. """
     # Load image
     if file is None:
-        img = screen.update()
+        img = screen.update().colour.copy()
     else:
         img = cv2.imread(file)
     height, width = img.shape[:2]
@@ -32,17 +32,17 @@ def draw_grid(grid_size=100, line_color=(0, 255, 0), text_color=(0, 0, 255), thi
     cv2.imwrite("tmp/screen-gridded.png", img)
 
 
-def extract_section(x1, x2, y1, y2, file=screen.CURRENT_SCREEN):
+def extract_section(x1, x2, y1, y2, file=None):
     """ Extract the section in gray scale. """
-    img = cv2.cvtColor(cv2.imread(file), cv2.COLOR_BGR2GRAY)
+    img = cv2.cvtColor(screen.colour() if file is None else cv2.imread(file), cv2.COLOR_BGR2GRAY)
     # Crop the "Event" region (manual pixel coords)
     crop = img[y1:y2, x1:x2]  # Example: img[60:95, 90:150]
     cv2.imwrite(OUTPUT_PATH, crop)
 
 
-def sample_colour(x, y, file=screen.CURRENT_SCREEN):
+def sample_colour(x, y, file=None):
     """ Prints colour at pixel in RGB format """
-    img = cv2.cvtColor(cv2.imread(file), cv2.COLOR_BGR2RGB)
+    img = cv2.cvtColor(screen.colour() if file is None else cv2.imread(file), cv2.COLOR_BGR2RGB)
     colour = img[y, x]
     print(f"Found colour: ({colour[0]}, {colour[1]}, {colour[2]})")
 
@@ -52,7 +52,7 @@ def debug_template_match():
     max_loc, max_val = screen._locate_image(OUTPUT_PATH)
 
     if max_loc:
-        img = cv2.imread(screen.CURRENT_SCREEN, cv2.IMREAD_COLOR)
+        img = screen.colour().copy()
         template = cv2.imread(OUTPUT_PATH, cv2.IMREAD_COLOR)
         h, w = template.shape[:2]
         cv2.rectangle(img, max_loc, (max_loc[0] + w, max_loc[1] + h), (0, 255, 0), 2)
@@ -1,17 +1,71 @@
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 from db.init import init_db
+from db.session import SessionLocal
 from core.log import logger
 from scrapers.ranking_scraper import RankingScraper
 from core.screenshot_processor import ScreenshotProcessor
 from core.screen import Screen
+from core.device_pool import DevicePool
+from core.ocr_pool import OCRPool
+from core.templates import TemplateRegistry
 
 """ 
-Requires running from the Chaos Ranking Otherworld BR leaderboard
+Requires running from the Chaos Ranking Otherworld BR leaderboard, on every emulator used.
+With several devices the rank range is split into one contiguous block per device, each run in its own process.
 """
 
-session = init_db()
-screen = Screen(logger)
-processer = ScreenshotProcessor()
-scraper = RankingScraper(screen, session, processer, logger)
-scraper.run()
 
-session.close()
+def scrape_ranks(serial: str = "emulator-5554", start: int = 1, end: int = 100, allow_self_update: bool = True,
+                 ocr_workers: int = 0, self_ready=None):
+    """ Scrapes ranks start..end of the leaderboard on one emulator, with OCR in a worker pool if ocr_workers is set.
+    Expects the database to have been initialised with init_db. See RankingScraper.run for self_ready.
+    """
+    device_logger = logger.getChild(serial)
+    session = SessionLocal()
+    screen = Screen(device_logger, serial)
+    processer = OCRPool(ocr_workers) if ocr_workers else ScreenshotProcessor()
+    try:
+        scraper = RankingScraper(screen, session, processer, device_logger)
+        scraper.current_taoist = start
+        scraper.run(max_rank=end, allow_self_update=allow_self_update, self_ready=self_ready)
+    finally:
+        processer.close()
+        screen.close()
+        session.close()
+    return serial
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--devices", nargs="*", help="adb serials to use, defaults to all connected devices")
+    parser.add_argument("--start", type=int, default=1, help="First rank to scrape")
+    parser.add_argument("--max-rank", type=int, default=100, help="Last rank to scrape")
+    parser.add_argument("--ocr-workers", type=int, default=0, help="OCR worker processes per device, 0 for in process")
+    args = parser.parse_args()
+
+    # Create and seed the database once, workers seeding at the same time would clash on the unique names
+    init_db().close()
+    shards = DevicePool(args.devices).shards(args.start, args.max_rank)
+    if len(shards) == 1:
+        scrape_ranks(*shards[0], ocr_workers=args.ocr_workers)
+        return
+
+    # Compile the template bundle once so the workers only read it
+    TemplateRegistry.load()
+    with multiprocessing.Manager() as manager, ProcessPoolExecutor(max_workers=len(shards)) as executor:
+        # Only one device updates our own taoist to avoid duplicate entries, the others wait for it to be added
+        self_ready = manager.Event()
+        futures = {executor.submit(scrape_ranks, serial, first, last, i == 0, args.ocr_workers, self_ready): serial
+                   for i, (serial, first, last) in enumerate(shards)}
+        for future in as_completed(futures):
+            try:
+                logger.info(f"Finished ranks on {future.result()}")
+            except Exception:
+                logger.exception(f"Scraping failed on {futures[future]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,17 @@
 import re
-import time
 
 import cv2
 import jellyfish
 import numpy as np
 
+from core.frame import Frame
+from core.ocr_pool import Deferred, resolve
+from core.profiling import profiler, sleep
 from core.screen import Screen
-from core.screenshot_processor import ScreenshotProcessor, parse_text_number
+from core.screenshot_processor import ScreenshotProcessor
 from db.service.char_scraper_service import CharacterScraperService
 from db.models.cultivation import CultivationMinorStage
-from core.image_functions import locate_area
+from core.image_functions import index_labels, locate_area
 
 
 class CharacterScraper:
@@ -39,28 +41,37 @@ class CharacterScraper:
         self.logger = logger
         self.own_character = own_character
         self.SIMILARITY_THRESHOLD = 0.85
+        # Rows kept above the newest scrolled strip while looking for the next label
+        self.WINDOW_ROWS = 400
+        # Stats whose label reads the same as another's share its template, only their position tells them apart
+        self.LABEL_TEMPLATES = {"paralysis_duration_boost_2": "paralysis_duration_boost"}
 
-    def get_start_loc(self, screenshot_path, template_path, x_offset):
+    def get_start_loc(self, screenshot, template_path, x_offset):
         """ Gets location of button given the search condition.
 
         Parameters
         ----------
-        screenshot_path : str
-            The image path to load and search
+        screenshot : str | Frame
+            The image path to load and search, or captured frame
         template_path : str
             The image to search for
         x_offset : int
             Offset to apply to x coordinate
         """
         # Find location
-        full_img = cv2.imread(screenshot_path)
-        template_img = cv2.cvtColor(cv2.imread(f'resources/character_scraper/{template_path}.png'), cv2.COLOR_BGR2GRAY)
+        full_img = Frame(cv2.imread(screenshot)) if isinstance(screenshot, str) else screenshot
+        template_img = self.screen.templates.get(f'character_scraper/{template_path}').gray
 
-        text_area = locate_area(cv2.cvtColor(full_img, cv2.COLOR_BGR2GRAY), template_img, 0.9)
+        with profiler.timed("matching"):
+            text_area = locate_area(full_img, template_img, 0.9)
         if text_area is None:
             self.logger.debug(f"Failed to get image '{template_path}'")
             return None
+        return self.label_loc(text_area, x_offset)
 
+    @staticmethod
+    def label_loc(text_area, x_offset):
+        """ Returns the search location of a value from the (x1, x2, y1, y2) area of its label. """
         box_y_offset = -40
 
         centre_y = (text_area[2] + text_area[3]) / 2
@@ -69,33 +80,152 @@ class CharacterScraper:
 
         return start_x, start_y
 
-    def get_value(self, screenshot_path, start_x, start_y, debug=False):
-        """ Gets the value from a saved image and search location. """
+    @staticmethod
+    def value_area(start_x, start_y):
+        """ Returns the (x1, x2, y1, y2) box of a stat value from its search location. """
         box_width = 230
         box_height = 50
+        return start_x, start_x + box_width, start_y - int(box_height / 2), start_y + int(box_height / 2)
 
-        search_area = (start_x, start_x + box_width, start_y - int(box_height / 2), start_y + int(box_height / 2))
+    def submit_values(self, img, locations) -> Deferred:
+        """ Queues the reads of the values at many search locations of one image as a single OCR batch.
 
-        if debug:
-            img = cv2.imread(screenshot_path)
-            cv2.rectangle(img, (start_x, start_y - int(box_height / 2)),
-                          (start_x + box_width, start_y + int(box_height / 2)), (0, 255, 0), 2)
-            clip_min, clip_max = max(search_area[2] - 20, 0), min(search_area[3] + 20, img.shape[0])
-            cv2.imshow("Search Area", img[clip_min:clip_max])
-            cv2.waitKey(0)
-            cv2.destroyAllWindows()
+        Parameters
+        ----------
+        img : str | array | Frame
+            The image path, image or frame to read from.
+        locations : list of (int, int)
+            Search locations from label_loc.
 
-        value = self.processor.extract_text_from_area(screenshot_path, area=search_area,
-                                                      thresholding=False,
-                                                      faint_text=not self.own_character)
-        try:
-            self.logger.advdebug(f"Retrieved text '{value}' as '{parse_text_number(value)}")
-            return parse_text_number(value)
-        except ValueError:
-            self.logger.advdebug(f"Retrieved text '{value}' as '0'")
-            return 0
+        Returns
+        -------
+        Deferred
+            Parsed value for each location, 0 if it couldn't be read.
+        """
+        values = self.processor.submit_numbers_batch(img, [self.value_area(x, y) for x, y in locations],
+                                                     faint_text=not self.own_character)
 
-    def validate_string(self, value: str, valid_strings: list, str_desc: str):
+        def parse(values):
+            self.logger.advdebug(f"Retrieved values {values}")
+            return [value or 0 for value in values]
+        return Deferred(parse, values)
+
+    def stream_values(self, strips, template_dir: str, ids: list, x_offset: int, spacing: int) -> Deferred:
+        """ Reads a scrolled list of stats from scroll_strips as it scrolls, queuing the OCR of each strip's values
+        straight away and stopping the scroll once every value has been queued.
+        Each value is positioned from its own label, found with index_labels as it comes into view. Labels that don't
+        match are spaced from their neighbours instead. Only the rows still needed are kept, never the whole list.
+
+        Parameters
+        ----------
+        strips : iterator
+            (row, strip) pairs from Screen.scroll_strips.
+        template_dir : str
+            Folder of the label templates under character_scraper, named by id.
+        ids : list of str
+            The stat ids from top to bottom.
+        x_offset : int
+            Offset from a label to its value.
+        spacing : int
+            Rows between labels.
+
+        Returns
+        -------
+        Deferred
+            id: value for every stat, 0 where it couldn't be read.
+
+        Raises
+        ------
+        ValueError
+            If none of the labels were found.
+        """
+        templates = {i: self.screen.templates.get(
+            f'character_scraper/{template_dir}/{self.LABEL_TEMPLATES.get(i, i)}').gray for i in ids}
+        window, window_top = None, 0
+        # (x1, x2, y1, y2) of each placed label in page rows, and the value search location from it
+        label_areas = []
+        locations = []
+        batches = []
+
+        def place(area):
+            label_areas.append(area)
+            locations.append(self.label_loc(area, x_offset))
+        for row, strip in strips:
+            # Add the strip to the rows kept so far, it replaces any rows it overlaps
+            if window is None or row < window_top:
+                window, window_top = strip, row
+            else:
+                window = np.concatenate([window[:row - window_top], strip])
+            window_bottom = window_top + len(window)
+
+            # Locate the labels that could have come into view, each below the last and about a spacing after it
+            first = len(locations)
+            pending = ids[first:first + len(window) // spacing + 1]
+            if label_areas:
+                _, _, last_top, last_bottom = label_areas[-1]
+                region = (0, window.shape[1], max(last_bottom - window_top, 0), len(window))
+                first_y = last_top + spacing - window_top
+            else:
+                region, first_y = None, None
+            with profiler.timed("matching"):
+                areas = index_labels(Frame(window), {i: templates[i] for i in pending}, 0.9, region, spacing,
+                                     first_y)
+            for idx, i in enumerate(pending, first):
+                if i not in areas:
+                    break
+                if areas[i] is not None:
+                    x1, x2, y1, y2 = areas[i]
+                    # Space any leading labels that didn't match back from the first one found
+                    for k in range(len(locations), idx):
+                        place((x1, x2, window_top + y1 - (idx - k) * spacing, window_top + y2 - (idx - k) * spacing))
+                    place((x1, x2, window_top + y1, window_top + y2))
+                elif label_areas:
+                    # Not where it was expected, space it from the label above
+                    x1, x2, y1, y2 = label_areas[-1]
+                    self.logger.advdebug(f"Label {i} not found, spacing it from {ids[idx - 1]}")
+                    place((x1, x2, y1 + spacing, y2 + spacing))
+
+            # Queue the values whose boxes are complete
+            queued = sum(len(batch) for batch, _ in batches)
+            ready = [(x, y) for x, y in locations[queued:] if self.value_area(x, y)[3] <= window_bottom]
+            ready_ids = ids[queued:queued + len(ready)]
+            # Boxes placed above the kept rows can't be read any more
+            lost = [i for i, (x, y) in zip(ready_ids, ready) if self.value_area(x, y)[2] < window_top]
+            if lost:
+                self.logger.warning(f"Values of {lost} scrolled out of the kept rows, using '0'")
+                batches.append((lost, [0] * len(lost)))
+            readable = [(i, (x, y - window_top)) for i, (x, y) in zip(ready_ids, ready) if i not in lost]
+            if readable:
+                values = self.submit_values(window, [location for _, location in readable])
+                batches.append(([i for i, _ in readable], values))
+            queued += len(ready)
+            if queued == len(ids):
+                break
+
+            # Keep the boxes still to read and enough rows above the bottom to find the next label
+            keep_from = min([self.value_area(x, y)[2] for x, y in locations[queued:]] +
+                            [window_bottom - self.WINDOW_ROWS, row])
+            if keep_from > window_top:
+                window, window_top = window[keep_from - window_top:], keep_from
+
+        if not locations:
+            self.logger.error(f"Failed to find any {template_dir} stats")
+            raise ValueError(f"No {template_dir} stat labels found in scrollshot")
+        if len(locations) < len(ids):
+            self.logger.warning(f"Labels {ids[len(locations):]} not found, spacing them from the last one")
+            x, y = locations[-1]
+            locations += [(x, y + k * spacing) for k in range(1, len(ids) - len(locations) + 1)]
+        queued = sum(len(batch) for batch, _ in batches)
+        if queued < len(ids):
+            self.logger.warning(f"Scroll ended before {ids[queued:]} were fully visible, using '0'")
+            batches.append((ids[queued:], [0] * (len(ids) - queued)))
+
+        def collect(*values):
+            return {i: value for (batch, _), batch_values in zip(batches, values)
+                    for i, value in zip(batch, batch_values)}
+        return Deferred(collect, *(values for _, values in batches))
+
+    def validate_string(self, value: str, valid_strings: list, str_desc: str, frame: Frame = None):
         """ Returns a valid string from the given list. Uses closest match if not exact.
         Gives warning if closest match is not close.
 
@@ -107,6 +237,8 @@ class CharacterScraper:
             The valid strings to match to
         str_desc : str
             A string describing what the value represents.
+        frame : Frame, optional
+            The frame the value was read from, saved for debugging instead of the current screen.
 
         Returns
         -------
@@ -119,12 +251,13 @@ class CharacterScraper:
         index = similarities.index(max(similarities))
         if max(similarities) < self.SIMILARITY_THRESHOLD:
             self.logger.warning(f"Unknown {str_desc} '{value}'")
-            self.screen.capture(name=f"debug/{str_desc}={value}.png", update=False)
+            self.screen.capture(name=f"debug/{str_desc}={value}.png", update=False, frame=frame)
         self.logger.debug(f"Unknown {str_desc} '{value}' "
                           f"using '{valid_strings[index]}' with similarity {similarities[index]:.3f}")
         return valid_strings[index], max(similarities)
 
-    def scrape_item(self, x: int, y: int, valid_names: list, item_type: str, full_match=False, check_double_path=False):
+    def scrape_item(self, x: int, y: int, valid_names: list, item_type: str, full_match=False, check_double_path=False,
+                    defer: bool = False):
         """ Scrapes an item for the name and turns it into an enumeration type.
         First opens it from the character screen.
         Generally separates out the last word as the name to check for most similar enumeration. Optionally can use full
@@ -144,6 +277,8 @@ class CharacterScraper:
             Whether to match full name against the enum, or just the last word.
         check_double_path : bool, optional
             Whether to check if the item is double path.
+        defer : bool, optional
+            Return a Deferred item and leave the OCR running while navigating back.
 
         Returns
         -------
@@ -155,15 +290,37 @@ class CharacterScraper:
         -----
         If no matching enum is found, a debug image of the item is captured and self.logger is given a warning.
         """
-        # Select item
+        # Select item and read text once it has opened
         self.screen.tap(x, y)
-        time.sleep(0.75)
-
-        # Read text
-        img = self.screen.update()
+        img = self.screen.wait_for_settle()
         name_bbox = (300, 1000, 250, 420)
+        text = self.processor.submit_text_from_area(img, name_bbox, all_text=True)
+
+        # If we are still on the character screen the slot may be empty, which needs the name before moving on
+        if self.screen.detect_states(["character_screen/pet_button"], frame=img)[0] is not None:
+            item, sim = self.item_name(text.result(), valid_names, item_type, full_match, check_double_path, img)
+            if sim < self.SIMILARITY_THRESHOLD:
+                return None
+        else:
+            item = Deferred(lambda t: self.item_name(t, valid_names, item_type, full_match, check_double_path, img)[0],
+                            text)
+
+        # Return back to main screen
+        self.screen.tap(500, 1800)
+        self.screen.wait_for_state("character_screen/pet_button")
+        return item if defer else resolve(item)
 
-        all_text = self.processor.extract_text_from_area(img, name_bbox, all_text=True)
+    def item_name(self, all_text: list, valid_names: list, item_type: str, full_match: bool, check_double_path: bool,
+                  img: Frame):
+        """ Turns the text read from an item into the most similar valid name, see scrape_item.
+
+        Returns
+        -------
+        item
+            The most similar valid name.
+        float
+            Similarity of the read name to the item.
+        """
         # Join all the text and rely on enhancement to split off the name
         # Otherwise (no enhancement) just assume that the first found value is probably correct
         if "+" in ' '.join(all_text):
@@ -188,23 +345,23 @@ class CharacterScraper:
         # Look for most similar enum value
         test_name = full_name.replace(' ', '_').upper()
         valid_names = valid_names if isinstance(valid_names, list) else [e.value for e in valid_names]
-        item, sim = self.validate_string(test_name, valid_names, item_type)
-        if sim < self.SIMILARITY_THRESHOLD:
-            # If we are on the character screen after failing to get a valid item, there probably isn't one.
-            if self.screen.find("state/character_screen/pet_button") is not None:
-                return None
-            self.screen.capture(f"debug/unknown_item_{test_name}.png", update=False)
-
-        # Return back to main screen
-        self.screen.tap(500, 1800)
-        self.screen.wait_for_state("character_screen/pet_button")
-        return item
-
-    def scrape_name(self):
+        item, sim = self.validate_string(test_name, valid_names, item_type, img)
+        # On the character screen a failed match means there isn't an item, only save reads of opened items
+        if sim < self.SIMILARITY_THRESHOLD and self.screen.detect_states(["character_screen/pet_button"],
+                                                                         frame=img)[0] is None:
+            self.screen.capture(f"debug/unknown_item_{test_name}.png", frame=img)
+        return item, sim
+
+    def scrape_name(self, defer: bool = False):
         """ Retrieves the name of the taoist.
         Uses the name found in the report screen as doesn't have a changeable background and won't be interfered with by
         the sect name.
 
+        Parameters
+        ----------
+        defer : bool, optional
+            Return a Deferred result and leave the OCR running while navigating back.
+
         Returns
         -------
         dict
@@ -212,26 +369,29 @@ class CharacterScraper:
         """
         # Open report screen by tapping more and report buttons
         self.screen.tap(200, 1225)
-        time.sleep(0.1)
+        sleep(0.1)
         if not self.screen.tap_button("character_screen/report"):
             self.logger.warning("Failed to get to report screen")
             return {}
-        time.sleep(0.1)
         # Capture text of name
-        img = self.screen.update()
-        all_text = self.processor.extract_text_from_area(
-            img, (100, 950, 550, 650), all_text=True, use_name_reader=True)
-        # Sanitise the name
-        text = ' '.join(all_text).split("player:")[-1].lower().strip().encode(errors='replace').decode()
+        img = self.screen.wait_for_settle()
+        all_text = self.processor.submit_text_from_area(img, (100, 950, 550, 650), all_text=True, use_name_reader=True)
         # Go back to home screen
-        self.screen.tap(500, 1500)
-        time.sleep(0.1)
-        self.screen.tap(500, 1500)
-        self.logger.info(f"Scraped name '{text}'")
-        return {"name": text}
-
-    def scrape_pets(self):
-        """ Scrapes equipped pet name and level. """
+        with self.screen.batch():
+            self.screen.tap(500, 1500)
+            self.screen.wait(0.1)
+            self.screen.tap(500, 1500)
+
+        def parse(all_text):
+            # Sanitise the name
+            text = ' '.join(all_text).split("player:")[-1].lower().strip().encode(errors='replace').decode()
+            self.logger.info(f"Scraped name '{text}'")
+            return {"name": text}
+        result = Deferred(parse, all_text)
+        return result if defer else result.result()
+
+    def scrape_pets(self, defer: bool = False):
+        """ Scrapes equipped pet name and level, returning a Deferred result if defer is set. """
         self.screen.tap_button("character_screen/pet")
         self.screen.wait_for_state("character_screen/pet_formation")
 
@@ -248,14 +408,14 @@ class CharacterScraper:
             ("mythic", (239, 41, 50)),
         ]
         # Invert image to get dark text with light border.
-        img = self.screen.update()
+        frame = self.screen.update()
+        img = frame.colour
         inverted_img = cv2.bitwise_not(img)
         valid_pets = self.service.get_pet_names()
+        # The names are one line each, so all three go through the recognizer in one batch
+        names = self.processor.submit_text_batch(inverted_img, [(x, x + width, 1080, 1110) for x in cols])
         # Zip the column to the formation array position
-        for x, i in zip(cols, ("front", "left", "right")):
-            # Send to upper to match db
-            val = self.processor.extract_text_from_area(inverted_img, (x, x + width, 1080, 1110)).upper()
-            val, _ = self.validate_string(val, valid_pets, "PET")
+        for n, (x, i) in enumerate(zip(cols, ("front", "left", "right"))):
             # Calculate the closest colour to get rarity
             colour = img[1190, x + int(width / 2)][::-1]  # Reverse since BGR by default
             colour_distance = [
@@ -263,17 +423,22 @@ class CharacterScraper:
                 for label, ref_rgb in reference_colours
             ]
             rarity = min(colour_distance, key=lambda x: x[1])[0].upper()
-            results[f"pet_{i}_id"] = self.service.get_pet_id(val)
+            results[f"pet_{i}_id"] = Deferred(
+                # Send to upper to match db
+                lambda texts, n=n: self.service.get_pet_id(
+                    self.validate_string(texts[n].upper(), valid_pets, "PET", frame)[0]),
+                names)
             results[f"pet_{i}_rarity"] = rarity
-            self.logger.advdebug(f"Found {val} of rarity {rarity}")
+            self.logger.advdebug(f"Found pet of rarity {rarity}")
 
         self.logger.debug("Finished scraping")
         # Exit pet screen and wait until we can see the button again
         self.screen.tap(500, 1500)
         self.screen.wait_for_state("/character_screen/pet_button")
-        return results
+        result = Deferred(lambda: {key: resolve(value) for key, value in results.items()})
+        return result if defer else result.result()
 
-    def scrape_total_br(self):
+    def scrape_total_br(self, defer: bool = False):
         """ Get the total BR from the compare BR screen.
         Assumes screen is open when scraping.
 
@@ -287,16 +452,21 @@ class CharacterScraper:
             self.screen.tap(800, 1800)
             self.screen.wait_for_state("../character_scraper/br_state")
         img = self.screen.update()
-        value = self.processor.extract_text_from_area(img, (820, 1000, 250, 300))
-        self.logger.debug(f"Found '{value}' and parsed as '{parse_text_number(value)}'")
+        value = self.processor.submit_number_from_area(img, (820, 1000, 250, 300))
         self.logger.info(f"Finished")
-        return {"total_br": parse_text_number(value)}
+        result = Deferred(lambda value: {"total_br": value}, value)
+        return result if defer else result.result()
 
-    def scrape_cultivation(self):
+    def scrape_cultivation(self, defer: bool = False):
         """ Retrieves cultivation and daemonfae levels from the two details screens.
         Pulls the stage and minor stage (early, middle, late) for cultivation. Same for daemonfae, but also gets the
         alignment.
 
+        Parameters
+        ----------
+        defer : bool, optional
+            Return a Deferred result and leave the OCR running while navigating back.
+
         Returns
         -------
         dict
@@ -307,9 +477,8 @@ class CharacterScraper:
             self.screen.tap(800, 1800)
             self.screen.wait_for_state("../character_scraper/br_state")
         # Find the character details and click it
-        self.screen.update()
         try:
-            _, character_y = self.get_start_loc(self.screen.CURRENT_SCREEN, 'br/character', 0)
+            _, character_y = self.get_start_loc(self.screen.update(), 'br/character', 0)
         except Exception:
             self.logger.error("Failed to find character details")
             return {}
@@ -317,7 +486,6 @@ class CharacterScraper:
         self.screen.tap(detail_x, character_y + detail_y_offset)
         self.screen.wait_for_state("character_screen/cultivation_exp")
 
-        result = {}
         # Get the 4 cultivation levels and go back
         img = self.screen.update()
         cultivation_x = (250, 490) if self.own_character else (700, 1000)
@@ -325,36 +493,40 @@ class CharacterScraper:
         minor_stage_names = [v.value for v in CultivationMinorStage]
         names = self.service.get_cultivation_types()
         text_y = [1010, 1100, 1185, 1270, 1360]
-        # Iterate through the different cultivation blocks
-        for y, name in zip(text_y, names):
-            area = (*cultivation_x, y - 40, y + 40)
-            text = ' '.join(self.processor.extract_text_from_area(
-                img, area, all_text=True, faint_text=self.own_character))
-            # Get the stage
-            stage = text.split(' ')[0].upper()
-            stage, _ = self.validate_string(stage, stage_names, "CULTIVATION_STAGE")
-            stage_id = self.service.get_cultivate_stage_id(stage)
-            minor_stage = None
-            # If not novice, try minor stage on all text blocks
-            if stage_id != 1:
-                text_parts = [t.upper() for t in text.split(' ')]
-                for ms in minor_stage_names:
-                    if ms in text_parts:
-                        minor_stage = ms
-                        break
-                if minor_stage is None:
-                    self.logger.warning(f"Missing minor stage for {stage}")
-
-            result[f"{name.lower()}_stage_id"] = stage_id
-            result[f"{name.lower()}_minor_stage"] = minor_stage
+        # Queue the different cultivation blocks
+        cultivation_text = [self.processor.submit_text_from_area(
+            img, (*cultivation_x, y - 40, y + 40), all_text=True, faint_text=self.own_character)
+            for y, _ in zip(text_y, names)]
         self.screen.tap(100, 1800)
 
+        def parse_cultivation(*all_text):
+            result = {}
+            for text, name in zip(all_text, names):
+                text = ' '.join(text)
+                # Get the stage
+                stage = text.split(' ')[0].upper()
+                stage, _ = self.validate_string(stage, stage_names, "CULTIVATION_STAGE", img)
+                stage_id = self.service.get_cultivate_stage_id(stage)
+                minor_stage = None
+                # If not novice, try minor stage on all text blocks
+                if stage_id != 1:
+                    text_parts = [t.upper() for t in text.split(' ')]
+                    for ms in minor_stage_names:
+                        if ms in text_parts:
+                            minor_stage = ms
+                            break
+                    if minor_stage is None:
+                        self.logger.warning(f"Missing minor stage for {stage}")
+
+                result[f"{name.lower()}_stage_id"] = stage_id
+                result[f"{name.lower()}_minor_stage"] = minor_stage
+            return result
+
         # Scroll to Daemonfae and open details
         daemonfae_y, _iter = None, 0
         while not daemonfae_y and _iter < 5:
             try:
-                self.screen.update()
-                _, daemonfae_y = self.get_start_loc(self.screen.CURRENT_SCREEN, 'br/daemonfae', 0)
+                _, daemonfae_y = self.get_start_loc(self.screen.update(), 'br/daemonfae', 0)
             except:
                 self.screen.swipe(820, 1300, 820, 1000)
                 self.screen.tap(820, 1300)  # Stop the scroll
@@ -365,8 +537,28 @@ class CharacterScraper:
         # Read stage + alignment
         img = self.screen.update()
         daemonfae_area = (250, 490, 960, 1050) if self.own_character else (700, 1000, 960, 1050)
-        text = ' '.join(self.processor.extract_text_from_area(
-            img, daemonfae_area, all_text=True, faint_text=self.own_character))
+        daemonfae_text = self.processor.submit_text_from_area(
+            img, daemonfae_area, all_text=True, faint_text=self.own_character)
+        self.screen.tap(100, 1800)
+        self.screen.wait_for_settle()
+        self.logger.info("Finished scraping")
+
+        def parse(daemonfae_text, *all_text):
+            result = parse_cultivation(*all_text)
+            result.update(self.parse_daemonfae(' '.join(daemonfae_text)))
+            self.logger.debug(f"Parsed levels '{result}'")
+            return result
+        result = Deferred(parse, daemonfae_text, *cultivation_text)
+        return result if defer else result.result()
+
+    def parse_daemonfae(self, text: str) -> dict:
+        """ Parses the alignment and stage out of the daemonfae details text.
+
+        Raises
+        ------
+        ValueError
+            If the text doesn't contain a stage like "Demon IV (Late)".
+        """
         self.logger.debug(f"Read daemonfae text '{text}'")
         # Match e.g., "Demon IV (Late)" or "Divinity 5 (Early)"
         pattern = r'\b([A-Za-z]+)\s+([IVX]+|\d+)\s*\(\s*(early|middle|late)\s*\)'
@@ -385,20 +577,20 @@ class CharacterScraper:
         else:
             raise ValueError(f"Unrecognized stage value: {stage_raw}")
         alignment = alignment if alignment.upper() != "DIVINITY" else "DIVINE"
-        result.update({
+        return {
             "alignment": alignment.upper(),
             "daemonfae_stage": stage,
             "daemonfae_minor_stage": minor_stage.upper()
-        })
-        self.screen.tap(100, 1800)
-        time.sleep(.25)
-        self.logger.debug(f"Parsed levels '{result}'")
-        self.logger.info("Finished scraping")
-        return result
+        }
 
-    def scrape_abilities(self):
+    def scrape_abilities(self, defer: bool = False):
         """ Retrieves equipped abilities from the compare BR screen
 
+        Parameters
+        ----------
+        defer : bool, optional
+            Return a Deferred result and leave the OCR running while navigating back.
+
         Returns
         -------
         dict
@@ -409,9 +601,8 @@ class CharacterScraper:
             self.screen.tap(800, 1800)
             self.screen.wait_for_state("../character_scraper/br_state")
         # Find the ability details and click it
-        self.screen.update()
         try:
-            _, character_y = self.get_start_loc(self.screen.CURRENT_SCREEN, 'br/ability', 0)
+            _, character_y = self.get_start_loc(self.screen.update(), 'br/ability', 0)
         except Exception:
             self.logger.error("Failed to find character details")
             return {}
@@ -420,32 +611,40 @@ class CharacterScraper:
         self.screen.wait_for_state("character_screen/ability_equipped")
 
         # Read all the 6 abilities
-        results = {}
         rows = [540, 705, 860]
         cols = [1005, 1215]
         x_len, y_len = 160, 95
         # Colour invert so that the light words with dark border -> dark words with light border
-        img = self.screen.update()
-        img = cv2.bitwise_not(img)
-        i = 0
+        frame = self.screen.update()
+        img = cv2.bitwise_not(frame.colour)
         valid_abilities = self.service.get_ability_names()
-        for x in rows:
-            for y in cols:
-                # Tends to work best with thresholding, sending to lower case to match db
-                val = ' '.join(self.processor.extract_text_from_area(img, (x, x + x_len, y, y + y_len),
-                                                                     all_text=True, thresholding=True)).lower()
-                val, _ = self.validate_string(val, valid_abilities, "ABILITY")
-                results[f"ability_{i}_id"] = self.service.get_ability_id(val)
-                i += 1
+        # Tends to work best with thresholding
+        texts = [self.processor.submit_text_from_area(img, (x, x + x_len, y, y + y_len), all_text=True,
+                                                      thresholding=True) for x in rows for y in cols]
         # Hit back button
         self.screen.tap(100, 1800)
-        time.sleep(.25)
+        self.screen.wait_for_settle()
         self.logger.info("Finished scraping")
-        return results
 
-    def scrape_relics(self):
+        def parse(*texts):
+            results = {}
+            for i, text in enumerate(texts):
+                # Sending to lower case to match db
+                val, _ = self.validate_string(' '.join(text).lower(), valid_abilities, "ABILITY", frame)
+                results[f"ability_{i}_id"] = self.service.get_ability_id(val)
+            return results
+        result = Deferred(parse, *texts)
+        return result if defer else result.result()
+
+    def scrape_relics(self, defer: bool = False):
         """ Scrapes the relics and curios that a Taoist is using.
-        Defines the coordinates for each item and scrapes them individually.
+        Defines the coordinates for each item and scrapes them individually, each item's OCR runs while the next is
+        opened.
+
+        Parameters
+        ----------
+        defer : bool, optional
+            Return a Deferred result rather than waiting for the last items' OCR.
 
         Returns
         -------
@@ -458,32 +657,29 @@ class CharacterScraper:
 
         # Weapon
         self.logger.debug(f"Getting weapon")
-        values["weapon_id"] = self.service.get_relic_id(
-            self.scrape_item(
-                col1, row1, self.service.get_relic_names("WEAPON"), "RELIC_WEAPON", check_double_path=True),
-            "WEAPON"
-        )
+        values["weapon_id"] = Deferred(
+            lambda item: self.service.get_relic_id(item, "WEAPON"),
+            self.scrape_item(col1, row1, self.service.get_relic_names("WEAPON"), "RELIC_WEAPON",
+                             check_double_path=True, defer=True))
         # Armour
         self.logger.debug(f"Getting armour")
-        values["armour_id"] = self.service.get_relic_id(
-            self.scrape_item(
-                col1, row2, self.service.get_relic_names("ARMOR"), "RELIC_ARMOR", check_double_path=True),
-            "ARMOR"
-        )
+        values["armour_id"] = Deferred(
+            lambda item: self.service.get_relic_id(item, "ARMOR"),
+            self.scrape_item(col1, row2, self.service.get_relic_names("ARMOR"), "RELIC_ARMOR",
+                             check_double_path=True, defer=True))
         # Accessory
         self.logger.debug(f"Getting accessory")
-        values["accessory_id"] = self.service.get_relic_id(
-            self.scrape_item(
-                col1, row3, self.service.get_relic_names("ACCESSORY"), "RELIC_ACCESSORY", check_double_path=True),
-            "ACCESSORY"
-        )
+        values["accessory_id"] = Deferred(
+            lambda item: self.service.get_relic_id(item, "ACCESSORY"),
+            self.scrape_item(col1, row3, self.service.get_relic_names("ACCESSORY"), "RELIC_ACCESSORY",
+                             check_double_path=True, defer=True))
 
         # Curio
         curios = self.service.get_curio_names()
         for i, r in enumerate([row1, row2, row3]):
             self.logger.debug(f"Getting curio_{i + 1}")
-            values[f"curio_{i + 1}_id"] = self.service.get_curio_id(
-                self.scrape_item(col2, r, curios, "CURIO", full_match=True))
+            values[f"curio_{i + 1}_id"] = Deferred(
+                self.service.get_curio_id, self.scrape_item(col2, r, curios, "CURIO", full_match=True, defer=True))
 
         # General relics
         general_relics = self.service.get_relic_names("GENERAL")
@@ -492,15 +688,22 @@ class CharacterScraper:
             for r in [880, 1000, 1130]:
                 i += 1
                 self.logger.debug(f"Getting relic_{i}")
-                values[f"relic_{i}_id"] = self.service.get_relic_id(
-                    self.scrape_item(c, r, general_relics, "GENERAL_RELIC"), "GENERAL")
+                values[f"relic_{i}_id"] = Deferred(
+                    lambda item: self.service.get_relic_id(item, "GENERAL"),
+                    self.scrape_item(c, r, general_relics, "GENERAL_RELIC", defer=True))
         self.logger.info("Finished scraping relics")
-        return values
+        result = Deferred(lambda: {key: resolve(value) for key, value in values.items()})
+        return result if defer else result.result()
 
-    def scrape_br_stats(self):
+    def scrape_br_stats(self, defer: bool = False):
         """ Scrapes the BR stat page for all the values, returning them in a dictionary.
         Checks we are on BR stat page before iterating through all the possible stats to get the image (top to bottom).
 
+        Parameters
+        ----------
+        defer : bool, optional
+            Return a Deferred result rather than waiting for the OCR.
+
         Returns
         -------
         dict
@@ -515,32 +718,21 @@ class CharacterScraper:
             self.screen.wait_for_state("../character_scraper/br_state")
 
         self.logger.debug("Starting scrollshot")
-        path = "tmp/br_scrollshot.png"
-        self.screen.capture_scrollshot(path, 200, 250,
-                                       (820, 1300, 820, 1200), (0, 1080, 800, 1700))
-
-        x, y_origin = self.get_start_loc(path, 'br/character', x_offset)
-        # For each identifier (in order)
-        values = {}
-        for idx, i in enumerate(ids):
-            y = y_origin + idx * 124
-            try:
-                val = self.get_value(path, x, y)
-            except Exception as e:
-                self.logger.error(f"Failed to find BR stat {i} at x={x}, y={y}")
-                raise e
-            if not val:
-                values[i] = 0
-            else:
-                values[i] = val
+        strips = self.screen.scroll_strips(200, 250, (820, 1300, 820, 1200), (0, 1080, 800, 1700))
+        result = self.stream_values(strips, 'br', ids, x_offset, 124)
         self.logger.info("Finished scraping")
-        return values
+        return result if defer else result.result()
 
-    def scrape_stat_stats(self):
+    def scrape_stat_stats(self, defer: bool = False):
         """ Scrapes the stats page for all the values, returning them in a dictionary.
         Checks we are on general stat page before iterating through all the possible stats to get the image
         (top to bottom).
 
+        Parameters
+        ----------
+        defer : bool, optional
+            Return a Deferred result rather than waiting for the OCR.
+
         Returns
         -------
         dict
@@ -566,47 +758,28 @@ class CharacterScraper:
             self.screen.wait_for_state("../character_scraper/stat_state")
 
         self.logger.debug("Starting scrollshot")
-        path = "tmp/stat_scrollshot.png"
-        self.screen.capture_scrollshot(path, 200, 250,
-                                       (640, 1300, 640, 1200), (0, 1080, 800, 1700))
-
-        x, y_origin = self.get_start_loc(path, 'stats/hp', x_offset)
-        # For each identifier (in order)
-        values = {}
-        n_reset = 6
-        for idx, i in enumerate(ids):
-            self.logger.advdebug(f"Finding value for '{i}'")
-            # Update start value every n_reset items to prevent drift
-            if idx % n_reset == 0:
-                x, y_origin = self.get_start_loc(path, f'stats/{i}', x_offset)
-            y = y_origin + (idx % n_reset) * 122
-            try:
-                val = self.get_value(path, x, y)
-            except Exception as e:
-                self.logger.error(f"Failed to find general stat {i} at x={x}, y={y}")
-                raise e
-            if not val:
-                values[i] = 0
-            else:
-                values[i] = val
+        strips = self.screen.scroll_strips(200, 250, (640, 1300, 640, 1200), (0, 1080, 800, 1700))
+        result = self.stream_values(strips, 'stats', ids, x_offset, 122)
         self.logger.debug("Finished scraping")
-        return values
+        return result if defer else result.result()
 
     def scrape(self):
         """ Scrapes full character stats """
         full_stats = {}
+        # Each phase's OCR finishes in the background while the next phase navigates, the results are collected last
+        parts = []
         self.logger.info("Starting character scrape")
         try:
             if not self.own_character:
                 # Get character identifying information
                 # Get the relic items if looking at different character
-                full_stats.update(self.scrape_name())
-                full_stats.update(self.scrape_relics())
-                full_stats.update(self.scrape_pets())
+                parts.append(self.scrape_name(defer=True))
+                parts.append(self.scrape_relics(defer=True))
+                parts.append(self.scrape_pets(defer=True))
             else:
                 self.logger.info("Skipped relic and name values as looking at own character")
             # Open compare screen by clicking the button
-            time.sleep(0.25)
+            self.screen.wait_for_settle(change_timeout=0)
             if not self.screen.tap_button("character_screen/compare_button"):
                 self.logger.warning("Failed to click compare br button")
                 return {}
@@ -614,15 +787,18 @@ class CharacterScraper:
             self.screen.filter_notifications = True
             self.screen.green_select = (590, 1080, 800, 900)
             # Get the total BR
-            full_stats.update(self.scrape_total_br())
+            parts.append(self.scrape_total_br(defer=True))
             # Get the cultivation and daemonfae
-            full_stats.update(self.scrape_cultivation())
+            parts.append(self.scrape_cultivation(defer=True))
             # Get equipped abilities
-            full_stats.update(self.scrape_abilities())
+            parts.append(self.scrape_abilities(defer=True))
             # Sweep through all the compare BR value
-            full_stats.update(self.scrape_br_stats())
+            parts.append(self.scrape_br_stats(defer=True))
             # Sweep through all the compare STAT values
-            full_stats.update(self.scrape_stat_stats())
+            parts.append(self.scrape_stat_stats(defer=True))
+            with profiler.phase("ocr_results"):
+                for part in parts:
+                    full_stats.update(resolve(part))
         except Exception as e:
             self.screen.back()
             raise e
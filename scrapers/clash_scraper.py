@@ -4,7 +4,7 @@ from typing import List
 import joblib
 
 from core.screen import Screen
-from core.screenshot_processor import ScreenshotProcessor, parse_text_number
+from core.screenshot_processor import ScreenshotProcessor
 from db.service.char_scraper_service import CharacterScraperService
 from db.service.ranking_scraper_service import RankingScraperService
 from scrapers.character_scraper import CharacterScraper
@@ -41,11 +41,10 @@ class ClashScraper:
         matches = self.screen.find_all_images("resources/clash_scraper/seek_br_symbol.png")
         matches = sorted(matches, key=lambda i: i[0][1])  # Sort in descending order (highest -> lowest challenge)
         brs = []
-        img = self.screen.colour()
+        img = self.screen.current_frame
         for (x, y), _ in matches:
             # Predefined area for BR value, just need y vals to get height correct
-            text = self.processor.extract_text_from_area(img, (285, 450, y, y + 40))
-            brs.append(parse_text_number(text))
+            brs.append(self.processor.extract_number_from_area(img, (285, 450, y, y + 40)))
 
         # Split last one (own br)
         self.logger.debug(f"Found opponent brs {brs[:-1]} with own br {brs[-1]}")
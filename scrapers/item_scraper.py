@@ -177,8 +177,7 @@ class ItemScraper:
         matches = self.screen.find_all_images(template_path, threshold=threshold)
 
         # 2. Update screen capture to color version
-        self.screen.update()
-        screen_img = self.screen.colour()  # Work with color image if available
+        screen_img = self.screen.update().colour.copy()  # Work with color image if available
 
         # 3. Draw circles on all matches
         for (x, y), score in matches:
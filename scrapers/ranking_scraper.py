@@ -1,7 +1,8 @@
 import time
 
 from scrapers.character_scraper import CharacterScraper
-from core.screenshot_processor import parse_text_number, ScreenshotProcessor
+from core.screenshot_processor import ScreenshotProcessor
+from core.profiling import sleep
 from core.screen import Screen, StateNotReached
 from db.service.char_scraper_service import CharacterScraperService
 from db.service.ranking_scraper_service import RankingScraperService
@@ -65,16 +66,12 @@ class RankingScraper:
 
         # Get basic stats
         name = self.processor.extract_text_from_area(
-            self.screen.CURRENT_SCREEN, (300, 750, 1450, 1550), use_name_reader=True)
-        br_text = self.processor.extract_text_from_area(
-            self.screen.CURRENT_SCREEN, (830, 1000, 1475, 1525))
-        rank_text = self.processor.extract_text_from_area(
-            self.screen.CURRENT_SCREEN, (55, 140, 1450, 1550))
-        br_val = parse_text_number(br_text)
-        rank = parse_text_number(rank_text)
+            self.screen.current_frame, (300, 750, 1450, 1550), use_name_reader=True)
+        br_val = self.processor.extract_number_from_area(self.screen.current_frame, (830, 1000, 1475, 1525))
+        rank = self.processor.extract_number_from_area(self.screen.current_frame, (55, 140, 1450, 1550))
         if not rank:
             self.logger.critcal("Failed to get own ranking")
-            raise ValueError(f"Rank is not valid from text '{rank_text}'")
+            raise ValueError(f"Rank is not valid from '{rank}'")
         self.my_ranking = rank
 
         self.my_database_id = self.service.check_for_existing_taoist(name, br_val)
@@ -90,20 +87,20 @@ class RankingScraper:
         # Get stats from Compare BR screen (via Top 1)
         self.taoist_scraper.own_character = True
         self.screen.tap(550, 300)  # Top 1 pixel coords
-        time.sleep(0.5)
+        self.screen.wait_for_settle()
         my_data = self.taoist_scraper.scrape()
         self.screen.back()
-        time.sleep(0.5)
+        self.screen.wait_for_settle()
 
         # Fix name + BR, then get relics/pets from own character screen
         my_data.update({"name": name, "total_br": br_val})
 
         self.screen.tap(300, 1500)  # My pixel coords
-        time.sleep(0.5)
+        self.screen.wait_for_settle()
         my_data.update(self.taoist_scraper.scrape_relics())
         my_data.update(self.taoist_scraper.scrape_pets())
         self.screen.back()
-        time.sleep(0.5)
+        self.screen.wait_for_settle()
 
         self.taoist_scraper.own_character = False
         self.my_database_id = self.service.add_taoist_from_scrape(my_data)
@@ -132,22 +129,22 @@ class RankingScraper:
         if self.current_taoist <= 3:
             # Top rank: open the character directly and use the character screen. Can take a while for some reason.
             self.screen.tap(row_x, row_y)
-            time.sleep(1.5)
+            self.screen.wait_for_settle(change_timeout=1.5, timeout=4)
             name = self.taoist_scraper.scrape_name()['name']
-            time.sleep(0.5)
+            self.screen.wait_for_settle()
 
             # Attempt to click the compare BR button to get BR value
             if not self.screen.tap_button("character_screen/compare_button"):
                 self.logger.warning("Failed to click compare BR button to get total BR")
                 br_val = 0
             else:
-                time.sleep(0.5)
+                self.screen.wait_for_settle()
                 br_val = self.taoist_scraper.scrape_total_br()["total_br"]
 
             self.screen.back()
-            time.sleep(0.2)
+            self.screen.wait_for_settle()
             self.screen.back()
-            time.sleep(0.2)
+            self.screen.wait_for_settle()
 
         else:
             # Lower rank: use OCR to extract name and BR from the list view
@@ -156,17 +153,14 @@ class RankingScraper:
             br_box = (830, 1000, row_y - 25, row_y + 25)
 
             self.screen.filter_notifications = True
-            self.screen.update()
+            frame = self.screen.update()
 
-            name_text = self.processor.extract_text_from_area(
-                self.screen.CURRENT_SCREEN, name_box, use_name_reader=True)
-            br_text = self.processor.extract_text_from_area(
-                self.screen.CURRENT_SCREEN, br_box)
+            name_text = self.processor.extract_text_from_area(frame, name_box, use_name_reader=True)
 
             self.screen.filter_notifications = False
 
             name = name_text
-            br_val = parse_text_number(br_text)
+            br_val = self.processor.extract_number_from_area(frame, br_box)
 
         return name, br_val
 
@@ -185,8 +179,7 @@ class RankingScraper:
             # If in character go back
             if self.screen.find("state/character_screen/pet_button"):
                 self.screen.back()
-                time.sleep(0.2)
-                self.screen.update()
+                self.screen.wait_for_settle()
             else:
                 raise StateNotReached("We managed to find no-mans land")
         # Find all the BR pics, sorted in ascending y.
@@ -197,14 +190,14 @@ class RankingScraper:
         ranks = []
         y_vals = []
         self.screen.filter_notifications = True
-        self.screen.update()
+        frame = self.screen.update()
         self.screen.filter_notifications = False
         # Get all the ranking numbers
         for (_, y), _ in br_positions:
             box = (55, 140, y, y + 60)  # Box x + size is constant, we just need the right y values from br icons.
-            text = self.processor.extract_text_from_area(self.screen.CURRENT_SCREEN, box)
             try:
-                ranks.append(int(text))
+                rank = self.processor.extract_number_from_area(frame, box)
+                ranks.append(int(rank))
                 y_vals.append(y + 30)  # Set the y value to be centred on the row with +30 offset
             except ValueError:
                 # Try to recover using last rank
@@ -213,7 +206,7 @@ class RankingScraper:
                     y_vals.append(y + 30)
                     self.logger.debug(f"Failed to get rank, assumed to be {ranks[-1]} due to last rank")
                 else:
-                    self.logger.warning(f"Failed to get rank from text '{text}'.")
+                    self.logger.warning(f"Failed to get rank at y={y}.")
 
         # Fail if we find less than 1 rank
         # (one means that only found self, edge case when character is open while looking for ranks)
@@ -254,8 +247,9 @@ class RankingScraper:
             _iter += 1
             # Make sure we offset the right way
             offset = -scroll_distance if scroll_down else scroll_distance
-            self.screen.swipe(1079, 1200, 1079, 1200 + offset, 200)  # 200 pixel ~1.5 rows
-            self.screen.swipe(500, 1200, 600, 1200, 900)  # Halt inertia scrolling
+            with self.screen.batch():
+                self.screen.swipe(1079, 1200, 1079, 1200 + offset, 200)  # 200 pixel ~1.5 rows
+                self.screen.swipe(500, 1200, 600, 1200, 900)  # Halt inertia scrolling
             ranks = self.get_visible_ranks()
 
         if self.current_taoist not in ranks:
@@ -276,26 +270,27 @@ class RankingScraper:
         """
         # Start screen by tapping more and duel buttons
         self.screen.tap(200, 1225)
-        time.sleep(0.1)
+        sleep(0.1)
         if not self.screen.tap_button("character_screen/duel"):
             self.logger.warning("Failed to get to start duel")
             return None
         start_time = time.perf_counter()
-        time.sleep(0.1)
+        sleep(0.1)
         # Wait until duel is finished, with 60s timeout for long duels
         try:
-            self.screen.wait_for_any_state(["battle_screen/victory", "battle_screen/defeat"], timeout=60)
+            result = self.screen.wait_for_any_state(["battle_screen/victory", "battle_screen/defeat"], timeout=60)
         except StateNotReached:
             return None
         duel_duration = time.perf_counter() - start_time
-        did_win = True if self.screen.find("state/battle_screen/victory") is not None else False
+        did_win = result == 0
         self.logger.debug(f"Duel finished with {'win' if did_win else 'loss'}")
 
         # Navigate back to leaderboard by exiting end screen, swiping towards right to find leaderboard button.
-        self.screen.tap(550, 1850)
-        time.sleep(0.1)
-        self.screen.swipe(800, 1000, 200, 1000, 200)
-        self.screen.tap(1000, 800)
+        with self.screen.batch():
+            self.screen.tap(550, 1850)
+            self.screen.wait(0.1)
+            self.screen.swipe(800, 1000, 200, 1000, 200)
+            self.screen.tap(1000, 800)
         # Click chaos rankings button, then top BR
         self.screen.tap_button("locations/town/chaos_rankings")
         self.screen.wait_for_state("locations/town/chaos_rankings/main_page")
@@ -324,7 +319,7 @@ class RankingScraper:
         taoist_id = self.service.check_for_existing_taoist(name, br)
         do_update = True if taoist_id is None else False
         self.screen.tap(row_x, row_y)
-        time.sleep(.5)
+        self.screen.wait_for_settle()
         if do_update:
             taoist_data = self.taoist_scraper.scrape()
             # Add taoist and get id in same step
@@ -333,7 +328,9 @@ class RankingScraper:
 
         # Duel and save results.
         result = self.duel_taoist()
-        if result is not None:
+        if result is not None and self.my_database_id is None:
+            self.logger.warning("Own taoist isn't in the database, not saving the duel result")
+        elif result is not None:
             did_win, duration = result
             if did_win:
                 self.service.add_duel_result(winner_id=self.my_database_id, loser_id=taoist_id, duration=duration)
@@ -342,7 +339,7 @@ class RankingScraper:
 
         return do_update
 
-    def run(self, max_rank: int = 100, allow_self_update: bool = True):
+    def run(self, max_rank: int = 100, allow_self_update: bool = True, self_ready=None):
         """ Iterates through leaderboard from current_taoist until max_rank.
 
         Parameters
@@ -351,12 +348,21 @@ class RankingScraper:
             Maximum rank to scrape to
         allow_self_update : bool
             Whether to update self.
+        self_ready : Event, optional
+            Shared with scrapers running in parallel. Set once own taoist is in the database when updating self,
+            otherwise waited on before looking own taoist up.
         """
         total_read = 0
         total_added = 0
 
         # Set own rank + database id
-        updated = self.setup_self(allow_self_update)
+        if self_ready is not None and not allow_self_update:
+            self_ready.wait()
+        try:
+            updated = self.setup_self(allow_self_update)
+        finally:
+            if self_ready is not None and allow_self_update:
+                self_ready.set()
         if allow_self_update:
             total_read += 1
             if updated:
@@ -375,6 +381,6 @@ class RankingScraper:
                 total_added += 1
             total_read += 1
             self.current_taoist += 1
-            time.sleep(.25)
+            sleep(.25)
 
         self.logger.info(f"Added {total_added}/{total_read} taoists from the leaderboard.")
@@ -0,0 +1,114 @@
+import struct
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from core import capture
+from core.capture import RawCapture, CaptureFailed
+
+
+@pytest.mark.parametrize("header_size", [12, 16])
+def test_parse_raw_screencap(header_size):
+    """ Check raw RGBA dumps are converted to BGR for both header versions. """
+    rgba = np.zeros((3, 2, 4), dtype=np.uint8)
+    rgba[..., 0] = 10  # R
+    rgba[..., 1] = 20  # G
+    rgba[..., 2] = 30  # B
+    rgba[..., 3] = 255
+    header = struct.pack("<III", 2, 3, 1) + b"\x00" * (header_size - 12)
+
+    capture = RawCapture()
+    capture.header_size = header_size
+    data = header + rgba.tobytes()
+    img = capture._parse(data, data, header_size)
+    assert img.shape == (3, 2, 3)
+    assert (img[0, 0] == [30, 20, 10]).all()
+
+
+def test_parse_unknown_format():
+    capture = RawCapture()
+    capture.header_size = 12
+    data = struct.pack("<III", 1, 1, 4) + b"\x00" * 4
+    with pytest.raises(CaptureFailed):
+        capture._parse(data, data, 12)
+
+
+class FakeChannel:
+    """ Stand in for the adb shell process, answering each screencap command with a frame unless it is stuck. """
+
+    def __init__(self, frame: bytes, stuck: bool = False):
+        self.frame = frame
+        self.stuck = stuck
+        self.pending = bytearray()
+        self.commands = []
+        self.killed = threading.Event()
+        self.stdin = self
+        self.stdout = self
+
+    def write(self, data: bytes):
+        self.commands.append(data)
+        if not self.stuck:
+            self.pending += self.frame
+
+    def flush(self):
+        pass
+
+    def readinto(self, view) -> int:
+        if not self.pending:
+            # A stuck channel blocks until it is killed, like a pipe that never gets data
+            self.killed.wait()
+            return 0
+        n = min(len(view), len(self.pending))
+        view[:n] = self.pending[:n]
+        del self.pending[:n]
+        return n
+
+    def poll(self):
+        return 0 if self.killed.is_set() else None
+
+    def kill(self):
+        self.killed.set()
+
+    def wait(self):
+        pass
+
+
+def raw_frame(level: int) -> bytes:
+    return struct.pack("<III", 2, 2, 1) + bytes([level, level, level, 255]) * 4
+
+
+def fake_adb(monkeypatch, channels: list):
+    """ Makes one-shot captures return level 1 frames and hands out the given channels in order. """
+    opened = []
+
+    def popen(command, **kwargs):
+        assert command[-3:] == ["shell", "-T", "sh"]
+        opened.append(channels[len(opened)])
+        return opened[-1]
+    monkeypatch.setattr(capture.subprocess, "Popen", popen)
+    monkeypatch.setattr(capture.subprocess, "run", lambda *args, **kwargs: SimpleNamespace(stdout=raw_frame(1)))
+    return opened
+
+
+def test_raw_capture_channel(monkeypatch):
+    channel = FakeChannel(raw_frame(7))
+    opened = fake_adb(monkeypatch, [channel])
+    raw = RawCapture()
+    assert raw.grab()[0, 0, 0] == 1
+    assert raw.grab()[0, 0, 0] == 7
+    assert raw.grab()[0, 0, 0] == 7
+    assert opened == [channel] and channel.commands == [b"screencap\n"] * 2
+
+
+def test_raw_capture_channel_timeout(monkeypatch):
+    stuck, working = FakeChannel(raw_frame(7), stuck=True), FakeChannel(raw_frame(9))
+    fake_adb(monkeypatch, [stuck, working])
+    raw = RawCapture()
+    raw.READ_TIMEOUT = 0.1
+    raw.grab()
+    # The stuck channel is killed and the frame comes from a one-shot capture
+    assert raw.grab()[0, 0, 0] == 1
+    assert stuck.killed.is_set()
+    assert raw.grab()[0, 0, 0] == 9
@@ -0,0 +1,21 @@
+from core.adb import adb_command
+from core.device_pool import DevicePool
+
+
+def test_adb_command_serial():
+    assert adb_command(None, "shell", "ls") == ["adb", "shell", "ls"]
+    assert adb_command("127.0.0.1:5555", "shell") == ["adb", "-s", "127.0.0.1:5555", "shell"]
+
+
+def test_shards_cover_range():
+    pool = DevicePool(["a", "b", "c"])
+    shards = pool.shards(1, 100)
+    assert [s[0] for s in shards] == ["a", "b", "c"]
+    assert shards[0][1] == 1 and shards[-1][2] == 100
+    # Contiguous with no gaps or overlap
+    for (_, _, last), (_, first, _) in zip(shards, shards[1:]):
+        assert first == last + 1
+
+
+def test_shards_fewer_ranks_than_devices():
+    assert DevicePool(["a", "b", "c"]).shards(5, 6) == [("a", 5, 5), ("b", 6, 6)]
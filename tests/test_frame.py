@@ -0,0 +1,34 @@
+import cv2
+import numpy as np
+import pytest
+
+from core.frame import Frame
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    return Frame(rng.integers(0, 255, (100, 80, 3), dtype=np.uint8))
+
+
+def test_frame_is_read_only(frame):
+    with pytest.raises(ValueError):
+        frame.colour[0, 0] = 0
+    with pytest.raises(ValueError):
+        frame.gray[0, 0] = 0
+
+
+def test_views_are_cached(frame):
+    assert frame.gray is frame.gray
+    assert frame.hsv is frame.hsv
+    assert frame.crop((10, 20, 30, 50), "gray") is frame.crop((10, 20, 30, 50), "gray")
+
+
+@pytest.mark.parametrize("view, code", [("gray", cv2.COLOR_BGR2GRAY), ("hsv", cv2.COLOR_BGR2HSV)])
+def test_crop_matches_full_view(frame, view, code):
+    """ Crops converted on their own must match crops of the converted frame. """
+    area = (5, 60, 10, 90)
+    expected = cv2.cvtColor(frame.colour, code)[10:90, 5:60]
+    assert (frame.crop(area, view) == expected).all()
+    getattr(frame, view)
+    assert (Frame(frame.colour.copy()).crop(area, view) == expected).all()
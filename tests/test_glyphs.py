@@ -0,0 +1,96 @@
+import json
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from core.glyphs import GlyphLibrary, GlyphReader, segment
+
+CHARSET = "0123456789.%KMBT"
+ROOT = os.path.dirname(os.path.dirname(__file__))
+
+
+def render(text, bg=40, fg=230):
+    img = np.full((50, 300), bg, dtype=np.uint8)
+    cv2.putText(img, text, (5, 38), cv2.FONT_HERSHEY_SIMPLEX, 1.0, fg, 2, cv2.LINE_AA)
+    return img
+
+
+@pytest.fixture
+def reader():
+    library = GlyphLibrary()
+    assert library.learn(render(CHARSET), CHARSET)
+    return GlyphReader(library)
+
+
+def test_segment_merges_multipart_glyphs():
+    glyphs = segment(render(CHARSET))
+    assert len(glyphs) == len(CHARSET)
+    # The decimal point is much shorter than the digits
+    assert glyphs[CHARSET.index(".")][1] < 0.5
+
+
+@pytest.mark.parametrize("text, number", [("12.5K", 12_500), ("987654", 987_654), ("3.07M", 3_070_000),
+                                          ("45.1%", 45.1), ("100B", 100_000_000_000)])
+def test_read_number(reader, text, number):
+    assert reader.read_number(render(text)) == pytest.approx(number)
+
+
+def test_dark_text_on_light_background(reader):
+    assert reader.read_number(render("2048", bg=230, fg=40)) == 2048
+
+
+def test_unknown_glyphs_not_confident(reader):
+    text, confidence = reader.read(render("xyz"))
+    assert confidence < reader.MIN_CONFIDENCE
+    assert reader.read_number(render("xyz")) is None
+
+
+def test_library_round_trip(reader, tmp_path):
+    path = str(tmp_path / "glyphs.npz")
+    reader.library.save(path)
+    loaded = GlyphLibrary.load(path)
+    assert len(loaded) == len(CHARSET)
+    assert GlyphReader(loaded).read_number(render("64.2K")) == pytest.approx(64_200)
+    assert len(GlyphLibrary.load(str(tmp_path / "missing.npz"))) == 0
+
+
+def test_ambiguous_glyphs_not_confident(reader):
+    # A second character with nearly the same sample as '8' makes every '8' a coin toss
+    glyph = reader.library.glyphs[reader.library.chars == "8"][0]
+    reader.library.add("S", np.clip(glyph + 0.02, 0, 1), 1.0)
+    assert reader.read(render("88"))[1] == 0
+    assert reader.read_number(render("88")) is None
+    assert reader.read_number(render("1.5K")) == pytest.approx(1_500)
+
+
+# Crops that aren't among the labelled samples the shipped library is built from
+HELD_OUT = [("relic_item11_t.png", (112, 256, 620, 664), "98.00%"),
+            ("divinity_item49.png", (118, 250, 858, 892), "333.00%"),
+            ("relic_item5_t.png", (620, 740, 832, 876), "4.68M"),
+            ("pet_item1.png", (478, 501, 1568, 1602), "T")]
+
+
+@pytest.fixture(scope="module")
+def shipped_reader():
+    return GlyphReader(GlyphLibrary.load(os.path.join(ROOT, GlyphLibrary.PATH)))
+
+
+def test_held_out_crops_not_labelled():
+    with open(os.path.join(ROOT, "screencaps/glyph_labels.json")) as file:
+        labels = json.load(file)
+    for file, (x1, x2, y1, y2), _ in HELD_OUT:
+        for label in labels:
+            lx1, lx2, ly1, ly2 = label["area"]
+            overlaps = x1 < lx2 and lx1 < x2 and y1 < ly2 and ly1 < y2
+            assert not (os.path.basename(label["file"]) == file and overlaps), f"{file} {label['area']} is labelled"
+
+
+@pytest.mark.parametrize("file, area, text", HELD_OUT)
+def test_shipped_library_reads_held_out_crops(shipped_reader, file, area, text):
+    img = cv2.imread(os.path.join(ROOT, "screencaps/scraped_items", file), cv2.IMREAD_GRAYSCALE)
+    x1, x2, y1, y2 = area
+    read, confidence = shipped_reader.read(img[y1:y2, x1:x2])
+    assert read == text
+    assert confidence >= shipped_reader.MIN_CONFIDENCE
@@ -0,0 +1,175 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from core.frame import Frame
+from core.image_functions import locate_image, locate_all_images, locate_image_pyramid, locate_all_images_pyramid, \
+    check_pyramid_accuracy, frame_difference, similar_images, find_peaks, stitch_images, ScrollStitcher, index_labels
+
+
+@pytest.fixture
+def screen():
+    """ Noisy grayscale screen with a distinct template pasted at (x=300, y=500). """
+    rng = np.random.default_rng(1)
+    img = rng.integers(0, 255, (1000, 600), dtype=np.uint8)
+    template = img[500:540, 300:360].copy()
+    return img, template
+
+
+@pytest.mark.parametrize("region", [None, (250, 400, 450, 600), (-50, 2000, 400, 5000)])
+def test_locate_image_region(screen, region):
+    """ Searching a window must give the same full image location as searching everything. """
+    img, template = screen
+    loc, val = locate_image(img, template, 0.9, region)
+    assert loc == (300, 500)
+    assert val > 0.99
+
+
+def test_locate_image_region_excludes(screen):
+    img, template = screen
+    assert locate_image(img, template, 0.9, (0, 200, 0, 400)) is None
+
+
+def test_locate_image_frame_region(screen):
+    img, template = screen
+    frame = Frame(np.dstack([img] * 3))
+    loc, _ = locate_image(frame, template, 0.9, (250, 400, 450, 600))
+    assert loc == (300, 500)
+
+
+@pytest.fixture(scope="module")
+def screencap():
+    """ A real grayscale screen capture, with the BR symbol pasted at known locations. """
+    root = os.path.dirname(os.path.dirname(__file__))
+    img = cv2.cvtColor(cv2.imread(os.path.join(root, "screencaps/scraped_items/relic_item1_t.png")),
+                       cv2.COLOR_BGR2GRAY)
+    symbol = cv2.cvtColor(cv2.imread(os.path.join(root, "resources/ranking_scraper/br_symbol.png")),
+                          cv2.COLOR_BGR2GRAY)
+    positions = [(801, 403), (801, 530), (801, 657), (150, 1311)]
+    for x, y in positions:
+        img[y:y + symbol.shape[0], x:x + symbol.shape[1]] = symbol
+    return img, symbol, positions
+
+
+@pytest.mark.parametrize("area", [(300, 900, 250, 320), (100, 400, 600, 700), (400, 600, 800, 860)])
+def test_pyramid_matches_exact(screencap, area):
+    """ The pyramid matcher must find the same location as the exact matcher. """
+    img, _, _ = screencap
+    x1, x2, y1, y2 = area
+    report = check_pyramid_accuracy(img, img[y1:y2, x1:x2].copy(), 0.9)
+    assert report["agree"], report
+    assert report["pyramid"][0] == (x1, y1)
+
+
+def test_pyramid_find_all_matches_exact(screencap):
+    img, symbol, positions = screencap
+    exact = locate_all_images(img, symbol, 0.9)
+    fast = locate_all_images_pyramid(img, symbol, 0.9)
+    assert sorted(p for p, _ in exact) == sorted(positions)
+    assert sorted(p for p, _ in fast) == sorted(positions)
+
+
+def test_pyramid_small_template_falls_back(screencap):
+    img, _, _ = screencap
+    template = img[400:410, 400:410].copy()
+    assert locate_image_pyramid(img, template, 0.5) == locate_image(img, template, 0.5)
+
+
+def test_frame_difference(screencap):
+    img, _, _ = screencap
+    frame = Frame(np.dstack([img] * 3))
+    assert frame_difference(frame, Frame(frame.colour.copy())) == 0
+    shifted = np.roll(img, 200, axis=0)
+    assert frame_difference(img, shifted) > 2
+
+
+def test_similar_images(screencap):
+    img, _, _ = screencap
+    colour = np.dstack([img] * 3)
+    noisy = cv2.add(colour, np.random.default_rng(3).integers(0, 3, colour.shape, dtype=np.uint8))
+    assert similar_images(colour, noisy)
+    assert similar_images(Frame(colour), Frame(noisy), scale=0.5)
+    scrolled = np.roll(colour, 100, axis=0)
+    assert not similar_images(colour, scrolled)
+    assert similar_images(colour, scrolled, max_difference=255)
+
+
+def _find_peaks_reference(res, threshold, max_results, radius):
+    """ The original list based suppression from Screen.find_all_images. """
+    matches = sorted([((x, y), res[y, x]) for (y, x) in zip(*np.where(res >= threshold))], key=lambda m: -m[1])
+    final_matches = []
+    taken = np.zeros_like(res)
+    for (pos, score) in matches:
+        x, y = pos
+        if not taken[y, x]:
+            final_matches.append((pos, score))
+            cv2.circle(taken, center=(x, y), radius=radius, color=True, thickness=-1)
+        if len(final_matches) >= max_results:
+            break
+    return final_matches
+
+
+@pytest.mark.parametrize("threshold", [0.9, 0.5, 0.3])
+def test_find_peaks_matches_reference(screencap, threshold):
+    """ Vectorised suppression must give the same top matches on a textured screen. """
+    img, symbol, _ = screencap
+    res = cv2.matchTemplate(img, symbol, cv2.TM_CCOEFF_NORMED)
+    expected = _find_peaks_reference(res, threshold, 10, 20)
+    assert [p for p, _ in find_peaks(res, threshold, 10, 20)] == [p for p, _ in expected]
+
+
+def _scroll_frames(shifts, height=300):
+    """ Frames of a textured page scrolled down by each shift in turn. """
+    rng = np.random.default_rng(2)
+    page = cv2.GaussianBlur(rng.integers(0, 255, (3000, 80, 3), dtype=np.uint8), (5, 5), 0)
+    tops = np.cumsum([0, *shifts])
+    return page, [page[top:top + height] for top in tops]
+
+
+@pytest.mark.parametrize("shifts", [[100] * 6, [90, 120, 100, 0, 0], [100, 60, 180, 100]])
+def test_scroll_stitcher_matches_stitch_images(shifts):
+    """ The banded search must stitch the same image, including scrolls far from the predicted distance. """
+    page, frames = _scroll_frames(shifts)
+    stitcher = ScrollStitcher(60, 50, shift=100, margin=30)
+    expected = None
+    for img in frames:
+        stitcher.add(img)
+        expected = img if expected is None else stitch_images(expected, img, 60, 50)
+    assert np.array_equal(stitcher.image, expected)
+    assert np.array_equal(stitcher.image, page[:len(expected)])
+    assert stitcher.full_searches == sum(abs(shift - 100) > 30 for shift in shifts)
+
+
+def test_index_labels():
+    rng = np.random.default_rng(6)
+    img = cv2.GaussianBlur(rng.integers(0, 255, (1500, 300), dtype=np.uint8), (3, 3), 0)
+    templates = {}
+    for i, y in enumerate(range(100, 1400, 130)):
+        templates[f"label_{i}"] = img[y:y + 30, 20:100].copy()
+    templates["missing"] = rng.integers(0, 255, (30, 80), dtype=np.uint8)
+    areas = index_labels(Frame(np.dstack([img] * 3)), templates, 0.9)
+    assert areas.pop("missing") is None
+    assert areas == {f"label_{i}": (20, 100, y, y + 30) for i, y in enumerate(range(100, 1400, 130))}
+
+
+def test_index_labels_repeated():
+    """ Identical labels must each be matched to their own row, and a label that doesn't match is left to be spaced
+    rather than taken from a row further down.
+    """
+    rng = np.random.default_rng(7)
+    img = cv2.GaussianBlur(rng.integers(0, 255, (1000, 300), dtype=np.uint8), (3, 3), 0)
+    first, repeated = img[100:130, 20:100].copy(), img[230:260, 20:100].copy()
+    rows = [100, 230, 360, 490, 620, 750]
+    for y in rows[2:]:
+        img[y:y + 30, 20:100] = repeated
+    img[750:780, 20:100] = first
+    templates = {"a": first, "b": repeated, "c": repeated, "d": repeated, "gone": rng.integers(0, 255, (30, 80),
+                 dtype=np.uint8), "e": first}
+    areas = index_labels(img, templates, 0.9, spacing=130)
+    assert areas["gone"] is None
+    assert {name: area[2] for name, area in areas.items() if area is not None} == \
+        {"a": 100, "b": 230, "c": 360, "d": 490, "e": 750}
+    # Labels whose band runs off the bottom are left for later
+    assert list(index_labels(img[:720], templates, 0.9, spacing=130)) == ["a", "b", "c", "d", "gone"]
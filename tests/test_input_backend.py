@@ -0,0 +1,91 @@
+import queue
+import subprocess
+
+import pytest
+
+from core import input_backend
+from core.input_backend import ShellInput
+
+
+class FakeShell:
+    """ Stand in for the adb shell process, answering each command line with the marker and the given status
+    unless it is stuck. """
+
+    def __init__(self, status: int = 0, stuck: bool = False):
+        self.status = status
+        self.stuck = stuck
+        self.lines = queue.Queue()
+        self.commands = []
+        self.killed = False
+        self.stdin = self
+        self.stdout = self
+
+    def write(self, line: str):
+        self.commands.append(line)
+        if not self.stuck:
+            self.lines.put(line.strip().split("; ")[-1].replace("echo ", "").replace("$?", str(self.status)) + "\n")
+
+    def flush(self):
+        pass
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        # A stuck shell blocks until it is killed, like a pipe that never gets data
+        line = self.lines.get()
+        if line is None:
+            raise StopIteration
+        return line
+
+    def poll(self):
+        return 0 if self.killed else None
+
+    def kill(self):
+        self.killed = True
+        self.lines.put(None)
+
+    def wait(self):
+        pass
+
+
+def fake_adb(monkeypatch, shells: list):
+    """ Hands out the given shells in order as sessions are opened. """
+    opened = []
+
+    def popen(command, **kwargs):
+        assert command[-1] == "shell"
+        opened.append(shells[len(opened)])
+        return opened[-1]
+    monkeypatch.setattr(input_backend.subprocess, "Popen", popen)
+    return opened
+
+
+def test_shell_input_reuses_session(monkeypatch):
+    shell = FakeShell()
+    opened = fake_adb(monkeypatch, [shell])
+    backend = ShellInput()
+    backend.run(["input tap 1 2"])
+    backend.run(["input tap 3 4", "sleep 0.1"])
+    assert opened == [shell]
+    assert shell.commands == [f"input tap 1 2; echo {ShellInput.MARKER} $?\n",
+                              f"input tap 3 4; sleep 0.1; echo {ShellInput.MARKER} $?\n"]
+
+
+def test_shell_input_failed_command(monkeypatch):
+    fake_adb(monkeypatch, [FakeShell(status=1)])
+    with pytest.raises(subprocess.CalledProcessError):
+        ShellInput().run(["input swipe bad"])
+
+
+def test_shell_input_timeout(monkeypatch):
+    stuck, working = FakeShell(stuck=True), FakeShell()
+    opened = fake_adb(monkeypatch, [stuck, working])
+    backend = ShellInput()
+    backend.READ_TIMEOUT = 0.1
+    with pytest.raises(ConnectionError):
+        backend.run(["input tap 1 2"])
+    # The wedged session is killed and the next call opens a new one
+    assert stuck.killed
+    backend.run(["input tap 1 2"])
+    assert opened == [stuck, working]
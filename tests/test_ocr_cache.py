@@ -0,0 +1,28 @@
+import numpy as np
+
+from core.screenshot_processor import OCRCache
+
+
+def test_cache_keys_on_pixels_and_options():
+    crop = np.arange(100, dtype=np.uint8).reshape(10, 10)
+    key = OCRCache.key(crop, "line", False)
+    assert key == OCRCache.key(crop.copy(), "line", False)
+    # Non contiguous views hash the same as their copies
+    assert OCRCache.key(np.tile(crop, 2)[:, :10], "line", False) == key
+    assert OCRCache.key(crop, "text", False) != key
+    assert OCRCache.key(crop.reshape(20, 5), "line", False) != key
+
+
+def test_cache_lru_and_counters(tmp_path):
+    cache = OCRCache(max_size=2, path=str(tmp_path / "ocr.json"))
+    cache.put("a", ["1"])
+    cache.put("b", ["2"])
+    assert cache.get("a") == ["1"]
+    cache.put("c", ["3"])
+    # b was least recently used
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.save()
+    loaded = OCRCache(path=str(tmp_path / "ocr.json"))
+    assert loaded.get("a") == ["1"] and loaded.get("c") == ["3"]
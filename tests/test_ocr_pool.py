@@ -0,0 +1,45 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+
+from core.frame import Frame
+from core.ocr_pool import Deferred, _crop_areas, resolve
+from core.profiling import profiler
+
+
+def test_crop_areas_keeps_pixels():
+    rng = np.random.default_rng(0)
+    img = rng.integers(0, 255, (200, 100, 3), dtype=np.uint8)
+    areas = [(10, 40, 20, 30), (50, 90, 100, 150), (5, 15, 60, 70)]
+    for source in (img, Frame(img.copy())):
+        crop, shifted = _crop_areas(source, areas)
+        assert crop.shape == (130, 85, 3)
+        for (x1, x2, y1, y2), (sx1, sx2, sy1, sy2) in zip(areas, shifted):
+            assert np.array_equal(img[y1:y2, x1:x2], crop[sy1:sy2, sx1:sx2])
+
+
+def test_deferred_resolves_once():
+    future = Future()
+    calls = []
+    deferred = Deferred(lambda text, n: calls.append(text) or f"{text}{n}", future, 1)
+    future.set_result("a")
+    nested = Deferred(lambda value: value.upper(), deferred)
+    assert resolve(nested) == "A1"
+    assert deferred.result() == "a1"
+    assert calls == ["a"]
+    assert resolve({"x": 1}) == {"x": 1}
+
+
+def test_resolve_waiting_is_profiled_as_ocr():
+    with ThreadPoolExecutor(1) as executor:
+        future = executor.submit(time.sleep, 0.02)
+        profiler.reset()
+        profiler.enabled = True
+        try:
+            with profiler.phase("ocr_results"):
+                resolve(Deferred(lambda value: value, future))
+        finally:
+            profiler.enabled = False
+    assert profiler.report()["ocr_results"]["categories"]["ocr"] >= 0.015
+    profiler.reset()
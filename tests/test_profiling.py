@@ -0,0 +1,29 @@
+import time
+
+from core.profiling import Profiler
+
+
+def test_profiler_categories_per_phase():
+    profiler = Profiler()
+    profiler.enabled = True
+    with profiler.phase("scrape_name"):
+        with profiler.timed("capture"):
+            time.sleep(0.01)
+            # Nested blocks only count towards the outer category
+            with profiler.timed("matching"):
+                time.sleep(0.01)
+        with profiler.timed("ocr"):
+            time.sleep(0.01)
+    report = profiler.report()["scrape_name"]
+    assert report["calls"] == 1
+    assert report["categories"]["capture"] >= 0.02
+    assert "matching" not in report["categories"]
+    assert report["counts"] == {"capture": 1, "ocr": 1}
+    assert abs(sum(report["categories"].values()) - report["total"]) < 1e-6
+
+
+def test_profiler_disabled_records_nothing():
+    profiler = Profiler()
+    with profiler.phase("scrape_name"), profiler.timed("capture"):
+        pass
+    assert profiler.report() == {}
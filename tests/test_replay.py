@@ -0,0 +1,72 @@
+import logging
+
+import numpy as np
+import pytest
+
+from core.replay import Recorder, RecordingSource, RecordingInput, ReplayDevice, ReplayDiverged
+from core.screen import Screen
+from core.templates import TemplateRegistry
+
+
+class FakeDevice:
+    """ Screen whose colour steps up by 10 on every input call. """
+
+    def __init__(self):
+        self.level = 0
+
+    def grab(self):
+        return np.full((64, 32, 3), self.level, dtype=np.uint8)
+
+    def run(self, commands):
+        self.level += 10
+
+    def close(self):
+        pass
+
+
+def record(folder):
+    device = FakeDevice()
+    recorder = Recorder(str(folder))
+    source, input_backend = RecordingSource(device, recorder), RecordingInput(device, recorder)
+    source.grab()
+    source.grab()
+    input_backend.run(["input tap 1 2"])
+    # Input straight after input, no frame captured in between
+    input_backend.run(["input tap 3 4", "sleep 0.1"])
+    source.grab()
+    source.close()
+
+
+def test_replay_switches_on_input(tmp_path):
+    record(tmp_path)
+    device = ReplayDevice(str(tmp_path))
+    assert device.grab()[0, 0, 0] == 0
+    assert device.grab()[0, 0, 0] == 0
+    # Runs past the recorded frames repeat the last one
+    assert device.grab()[0, 0, 0] == 0
+    device.run(["input tap 1 2"])
+    assert device.grab()[0, 0, 0] == 0
+    device.run(["input tap 3 4", "sleep 0.1"])
+    assert device.grab()[0, 0, 0] == 20
+
+
+def test_replay_strict_divergence(tmp_path):
+    record(tmp_path)
+    device = ReplayDevice(str(tmp_path))
+    with pytest.raises(ReplayDiverged):
+        device.run(["input tap 9 9"])
+    loose = ReplayDevice(str(tmp_path), strict=False)
+    loose.run(["input tap 9 9"])
+
+
+def test_screen_on_replay(tmp_path):
+    record(tmp_path)
+    device = ReplayDevice(str(tmp_path))
+    screen = Screen(logging.getLogger("test_replay"), source=device, input_backend=device,
+                    templates=TemplateRegistry(str(tmp_path)))
+    assert screen.dimensions == (32, 64)
+    screen.tap(1, 2)
+    with screen.batch():
+        screen.tap(3, 4)
+        screen.wait(0.1)
+    assert screen.update().colour[0, 0, 0] == 20
@@ -0,0 +1,100 @@
+import logging
+
+import cv2
+import numpy as np
+
+import core.log  # noqa: F401, adds Logger.advdebug
+from core.screen import Screen
+from core.templates import TemplateRegistry
+
+
+class ScrollingDevice:
+    """ Shows a window of a tall page, moving down by the swipe distance on every swipe until the end. """
+
+    def __init__(self, page: np.ndarray, height: int):
+        self.page = page
+        self.height = height
+        self.top = 0
+        self.swipes = 0
+
+    def grab(self):
+        return self.page[self.top:self.top + self.height].copy()
+
+    def run(self, commands):
+        for command in commands:
+            _, _, x1, y1, x2, y2, _ = command.split()
+            self.top = min(self.top + int(y1) - int(y2), len(self.page) - self.height)
+            self.swipes += 1
+
+    def close(self):
+        pass
+
+
+def scroll_screen(tmp_path, monkeypatch):
+    monkeypatch.setattr("core.screen.sleep", lambda seconds: None)
+    rng = np.random.default_rng(4)
+    page = cv2.GaussianBlur(rng.integers(0, 255, (1200, 60, 3), dtype=np.uint8), (5, 5), 0)
+    device = ScrollingDevice(page, 300)
+    screen = Screen(logging.getLogger("test_screen"), source=device, input_backend=device,
+                    templates=TemplateRegistry(str(tmp_path)))
+    return page, device, screen
+
+
+def test_scrollshot_runs_to_end(tmp_path, monkeypatch):
+    page, device, screen = scroll_screen(tmp_path, monkeypatch)
+    shot = screen.capture_scrollshot(60, 50, (30, 200, 30, 100))
+    assert np.array_equal(shot.colour, page)
+    # Three extra swipes to notice the screen stopped moving
+    assert device.swipes == 13
+
+
+def test_scroll_strips(tmp_path, monkeypatch):
+    page, device, screen = scroll_screen(tmp_path, monkeypatch)
+    rebuilt = np.zeros_like(page)
+    for row, strip in screen.scroll_strips(60, 50, (30, 200, 30, 100)):
+        rebuilt[row:row + len(strip)] = strip
+        if row + len(strip) >= 700:
+            break
+    assert np.array_equal(rebuilt[:700], page[:700])
+    # Stopping iteration stops the scroll
+    assert device.swipes == 4
+
+
+class AnimatedDevice:
+    """ Shows fresh noise on every grab, like a screen with an idle animation that never settles. """
+
+    def __init__(self):
+        self.rng = np.random.default_rng(5)
+
+    def grab(self):
+        return self.rng.integers(0, 255, (300, 60, 3), dtype=np.uint8)
+
+    def close(self):
+        pass
+
+
+class FakeClock:
+    """ Stands in for the time module, moving forward by step on every call. """
+
+    def __init__(self, step):
+        self.now = 0.
+        self.step = step
+
+    def time(self):
+        self.now += self.step
+        return self.now
+
+
+def test_wait_for_settle_gives_up_on_animation(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr("core.screen.sleep", lambda seconds: None)
+    clock = FakeClock(0.05)
+    monkeypatch.setattr("core.screen.time", clock)
+    device = AnimatedDevice()
+    screen = Screen(logging.getLogger("test_screen"), source=device, input_backend=device,
+                    templates=TemplateRegistry(str(tmp_path)))
+    start = clock.now
+    with caplog.at_level(logging.DEBUG, logger="test_screen"):
+        frame = screen.wait_for_settle()
+    assert frame is not None
+    assert clock.now - start < Screen.SETTLE_TIMEOUT + 1
+    assert "didn't settle" in caplog.text
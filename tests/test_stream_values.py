@@ -0,0 +1,99 @@
+import logging
+from concurrent.futures import Future
+
+import cv2
+import numpy as np
+import pytest
+
+from core.log import ADVDEBUG
+from core.screen import Screen
+from scrapers.character_scraper import CharacterScraper
+from tests.test_screen import ScrollingDevice
+
+
+class LabelTemplates:
+    """ Template registry holding the label images of a synthetic stat list. """
+
+    def __init__(self, labels):
+        self.labels = labels
+
+    def get(self, path):
+        template = type("Template", (), {})()
+        template.gray = cv2.cvtColor(self.labels[path.split("/")[-1]], cv2.COLOR_BGR2GRAY)
+        return template
+
+
+class MeanProcessor:
+    """ Reads each value box as its mean grey level. """
+
+    def submit_numbers_batch(self, img, areas, faint_text=False):
+        future = Future()
+        future.set_result([float(img[y1:y2, x1:x2].mean()) for x1, x2, y1, y2 in areas])
+        return future
+
+
+def stat_list(n, spacing=122, first_top=150, broken=(), seed=5):
+    """ Builds a scrolling page of n labelled stats, label i with value i * 10 in the box stream_values reads.
+
+    Returns
+    -------
+    CharacterScraper, ScrollingDevice, list of str
+        Scraper reading from the page, the device showing it and the stat ids from top to bottom.
+    """
+    rng = np.random.default_rng(seed)
+    page = cv2.GaussianBlur(rng.integers(0, 255, (first_top + n * spacing + 900, 400, 3), dtype=np.uint8), (3, 3), 0)
+    ids = [f"stat{i}" for i in range(n)]
+    labels = {}
+    for i, name in enumerate(ids):
+        top = first_top + i * spacing
+        label = rng.integers(0, 255, (40, 80, 3), dtype=np.uint8)
+        page[top:top + 40, 10:90] = label
+        # Broken labels have a template that matches nothing on the page
+        labels[name] = rng.integers(0, 255, (40, 80, 3), dtype=np.uint8) if i in broken else label
+        page[max(top - 45, 0):top + 5, 110:340] = i * 10
+    device = ScrollingDevice(page, 900)
+    screen = Screen(logging.getLogger("test_stream_values"), source=device, input_backend=device,
+                    templates=LabelTemplates(labels))
+    scraper = CharacterScraper(screen, None, MeanProcessor(), logging.getLogger("test_stream_values"))
+    return scraper, device, ids
+
+
+def stream(scraper, ids, spacing=122):
+    # 100 row swipes, so the 40 row labels regularly straddle two strips
+    strips = scraper.screen.scroll_strips(200, 250, (0, 1300, 0, 1200))
+    return scraper.stream_values(strips, "stats", ids, 100, spacing).result()
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr("core.screen.sleep", lambda seconds: None)
+
+
+def test_labels_across_strips():
+    scraper, device, ids = stat_list(20)
+    assert stream(scraper, ids) == {i: k * 10 for k, i in enumerate(ids)}
+
+
+def test_stops_once_queued():
+    scraper, device, ids = stat_list(20)
+    stream(scraper, ids)
+    # The page runs 900 rows past the last label, the scroll stops well before its end
+    assert device.top + device.height < len(device.page) - 500
+
+
+def test_unmatched_labels(caplog):
+    scraper, device, ids = stat_list(20, broken={0, 7})
+    with caplog.at_level(ADVDEBUG, logger="test_stream_values"):
+        values = stream(scraper, ids)
+    # Leading labels are spaced back from the first found, later ones from the label above
+    assert values == {i: k * 10 for k, i in enumerate(ids)}
+    assert "Label stat7 not found, spacing it from stat6" in caplog.text
+
+
+def test_box_above_window(caplog):
+    # The first value box starts above the top of the list
+    scraper, device, ids = stat_list(5, first_top=20)
+    with caplog.at_level(logging.WARNING, logger="test_stream_values"):
+        values = stream(scraper, ids)
+    assert values == {"stat0": 0, **{i: k * 10 for k, i in enumerate(ids) if k}}
+    assert "['stat0'] scrolled out of the kept rows" in caplog.text
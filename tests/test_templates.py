@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+from core.templates import TemplateRegistry
+
+ROOT = os.path.join(os.path.dirname(os.path.dirname(__file__)), "resources")
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return TemplateRegistry(ROOT).scan()
+
+
+@pytest.mark.parametrize("path, name", [
+    ("resources/state/character_screen/pet_button.png", "state/character_screen/pet_button"),
+    ("resources/state/../character_scraper/br_state.png", "character_scraper/br_state"),
+    ("resources/state//character_screen/pet_button.png", "state/character_screen/pet_button"),
+    ("buttons/character_screen/duel", "buttons/character_screen/duel"),
+])
+def test_logical_names(path, name):
+    assert TemplateRegistry().name(path) == name
+
+
+def test_scan_and_get(registry):
+    template = registry.get(os.path.join(ROOT, "ranking_scraper/br_symbol.png"))
+    assert template.gray.ndim == 2
+    assert (template.width, template.height) == (54, 54)
+    with pytest.raises(FileNotFoundError):
+        registry.get("missing/template")
+
+
+def test_bundle_round_trip(registry, tmp_path):
+    registry.templates["ranking_scraper/br_symbol"].region = (0, 100, 0, 200)
+    bundle = str(tmp_path / "templates.npz")
+    registry.save(bundle)
+
+    loaded = TemplateRegistry.load(ROOT, bundle)
+    assert set(loaded.templates) == set(registry.templates)
+    assert loaded.get("ranking_scraper/br_symbol").region == (0, 100, 0, 200)
+    for name, template in registry.templates.items():
+        assert (loaded.get(name).gray == template.gray).all()
+
+
+def test_sidecar_regions(registry):
+    assert registry.get("clash_scraper/seek_br_symbol").region == (0, 540, 0, 1920)